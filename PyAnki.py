@@ -1,26 +1,35 @@
+import bisect
+import concurrent.futures
 import csv
 import datetime
+import hashlib
+import heapq
+import importlib.util
+import itertools
 import random
 import os
+import pathlib
 import sys
+import time
+import weakref
 import io # For handling image data in memory (keep for stats plot)
 import math # For ceiling function in interval calculation
+import operator
 import re # For cleaning up math text (less critical now, but keep for safety)
 import tkinter as tk # Base tkinter for listbox & messagebox
 from tkinter import ttk # For Treeview (card browser)
 from tkinter import messagebox # For showing errors/info
 import customtkinter as ctk # Use CustomTkinter for modern widgets
 # from customtkinter import CTkImage # No longer needed for math rendering
-from typing import List, Dict, Any, Optional, Tuple, Set
-from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional, Tuple, Set, Callable, Deque
+from collections import Counter, OrderedDict, defaultdict, deque
+from functools import partial
 import html # For escaping content in HTML
 
 # --- Pillow Dependency (Still needed for Matplotlib/Stats) ---
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+# Only located here, not imported: nothing uses it directly, and the import would slow down startup
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+if not PIL_AVAILABLE:
     print("Warning: Pillow library not found. Statistics plotting might be affected.")
     print("Install it using: pip install Pillow")
 
@@ -34,21 +43,42 @@ except ImportError:
     print("Install it using: pip install tkinterweb")
 
 # --- Matplotlib Integration (Still needed for Stats) ---
-try:
-    import matplotlib
-    matplotlib.use('Agg') # Use Agg backend for non-interactive image generation
-    import matplotlib.pyplot as plt
-    from matplotlib.figure import Figure
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-    MATPLOTLIB_AVAILABLE = True
-    # Configure Matplotlib for mathtext
-    # matplotlib.rcParams['mathtext.fontset'] = 'stix' # Less relevant now
-    # matplotlib.rcParams['font.family'] = 'STIXGeneral' # Less relevant now
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+# Located at startup but imported by _load_matplotlib when the stats window first opens; it dominates import time
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+_matplotlib_loaded = False
+if not MATPLOTLIB_AVAILABLE:
     print("Warning: Matplotlib not found. Statistics plotting will be disabled.")
     print("Install it using: pip install matplotlib")
 
+def _load_matplotlib() -> bool:
+    """Imports the Matplotlib pieces used by the stats chart on first call. Returns MATPLOTLIB_AVAILABLE."""
+    global MATPLOTLIB_AVAILABLE, _matplotlib_loaded, Figure, FigureCanvasTkAgg, NavigationToolbar2Tk
+    if _matplotlib_loaded or not MATPLOTLIB_AVAILABLE: return MATPLOTLIB_AVAILABLE
+    try:
+        import matplotlib
+        matplotlib.use('Agg') # Use Agg backend for non-interactive image generation
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        _matplotlib_loaded = True
+    except ImportError as e:
+        MATPLOTLIB_AVAILABLE = False
+        print(f"Warning: Matplotlib could not be imported ({e}). Statistics plotting will be disabled.")
+    return MATPLOTLIB_AVAILABLE
+
+# --- NumPy (optional, installed with Matplotlib; speeds up statistics on large decks) ---
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Optional dependencies reported at startup when missing: (available, install hint)
+_DEPENDENCY_MESSAGES = (
+    (PIL_AVAILABLE, "Pillow (for Stats Plots): pip install Pillow"),
+    (TKINTERWEB_AVAILABLE, "tkinterweb (for Math Rendering): pip install tkinterweb"),
+    (MATPLOTLIB_AVAILABLE, "Matplotlib (for Stats Plots): pip install matplotlib"),
+)
+
 # --- Configuration ---
 DATE_FORMAT = "%Y-%m-%d"
 DECKS_DIR = "decks"
@@ -56,6 +86,13 @@ APP_NAME = "PyAnki CSV - Enhanced SRS + Mgmt (Web Math)" # Updated name
 INITIAL_INTERVAL_DAYS = 1.0 # Default interval for first 'Good' rating
 MINIMUM_INTERVAL_DAYS = 1.0 # Smallest interval allowed after review (except lapse)
 STATS_FORECAST_DAYS = 30 # How many days into the future to show in stats plot
+HTML_CACHE_SIZE = 256 # Max generated card/message HTML strings kept in memory (LRU)
+SAVE_DEBOUNCE_MS = 5000 # Card adds/edits are written this long after the last one (and always on close)
+CARD_LIST_PAGE_SIZE = 200 # Card manager rows inserted per page; more are paged in while scrolling
+CARD_LIST_ASYNC_THRESHOLD = 5000 # Decks larger than this are filtered/sorted for the card manager on a worker thread
+IN_PLACE_DELETE_MAX_FRACTION = 0.05 # Card manager deletions of at most this share of the deck edit deck_data in place
+NUMPY_SHUFFLE_THRESHOLD = 1000 # Due queues larger than this are shuffled with a NumPy permutation
+STATS_BAR_COLOR = "#1f77b4"; STATS_LINE_COLOR = "#ff7f0e" # Forecast chart series colours (independent of theme)
 # MATH_RENDER_DPI = 150 # No longer directly used for rendering
 
 # --- SRS Algorithm Parameters ---
@@ -76,16 +113,30 @@ GRAY_NAME_TO_HEX = {
     "gray86": "#DBDBDB",
 }
 
+# --- KaTeX Assets ---
+# A local copy of KaTeX's dist/ folder in ./katex (next to this script) is used when present, so cards render
+# offline and without a network round-trip; otherwise the CDN is used.
+KATEX_CDN_BASE = "https://cdn.jsdelivr.net/npm/katex@0.16.10/dist"
+KATEX_LOCAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "katex")
+KATEX_REQUIRED_FILES = ("katex.min.css", "katex.min.js", os.path.join("contrib", "auto-render.min.js"))
+
+def _resolve_katex_asset_base() -> str:
+    """Returns the base URL for KaTeX assets: the local bundle as a file:// URI if complete, else the CDN."""
+    if all(os.path.isfile(os.path.join(KATEX_LOCAL_DIR, name)) for name in KATEX_REQUIRED_FILES):
+        return pathlib.Path(KATEX_LOCAL_DIR).as_uri()
+    return KATEX_CDN_BASE
+
+KATEX_ASSET_BASE = _resolve_katex_asset_base() # Resolved once at startup
+
 # --- KaTeX HTML Template ---
-# Using KaTeX CDN for simplicity
 KATEX_HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/katex@0.16.10/dist/katex.min.css" integrity="sha384-wcIxkf4k55gneciyhY3XcN2sdXKMvolRUmyzfHZkugLv9GzmG_MVoYV1lSAvK0oK" crossorigin="anonymous">
-    <script defer src="https://cdn.jsdelivr.net/npm/katex@0.16.10/dist/katex.min.js" integrity="sha384-hIoBPJpTUs74ddyc4bFZSM1gAU6LPlGMyW0JclP1sFpLryPmvMhO84U+fJ90KxjJ" crossorigin="anonymous"></script>
-    <script defer src="https://cdn.jsdelivr.net/npm/katex@0.16.10/dist/contrib/auto-render.min.js" integrity="sha384-43gviWU0YVjaL4JiEAJSC7QYqC5Bpb9+6L8/F/r36pQhApUo/n1hGzJ/0hG7h1z/w" crossorigin="anonymous"
+    <link rel="stylesheet" href="{katex_base}/katex.min.css" integrity="sha384-wcIxkf4k55gneciyhY3XcN2sdXKMvolRUmyzfHZkugLv9GzmG_MVoYV1lSAvK0oK" crossorigin="anonymous">
+    <script defer src="{katex_base}/katex.min.js" integrity="sha384-hIoBPJpTUs74ddyc4bFZSM1gAU6LPlGMyW0JclP1sFpLryPmvMhO84U+fJ90KxjJ" crossorigin="anonymous"></script>
+    <script defer src="{katex_base}/contrib/auto-render.min.js" integrity="sha384-43gviWU0YVjaL4JiEAJSC7QYqC5Bpb9+6L8/F/r36pQhApUo/n1hGzJ/0hG7h1z/w" crossorigin="anonymous"
         onload="renderMathInElement(document.body, {{ delimiters: [ {{left: '$', right: '$', display: false}}, {{left: '$$', right: '$$', display: true}} ], throwOnError: false }});"></script>
     <style>
         body {{
@@ -120,11 +171,24 @@ KATEX_HTML_TEMPLATE = """
 
 
 # --- Core Logic Functions ---
+_parsed_date_cache: Dict[str, datetime.date] = {} # Review dates repeat heavily across a deck
+
+def _parse_date_cached(date_str: str) -> datetime.date:
+    """Parses a stripped DATE_FORMAT string, caching the result. Raises ValueError if invalid."""
+    parsed = _parsed_date_cache.get(date_str)
+    if parsed is None:
+        if DATE_FORMAT == "%Y-%m-%d" and len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+            parsed = datetime.date.fromisoformat(date_str) # C fast path, same result as strptime for this shape
+        else:
+            parsed = datetime.datetime.strptime(date_str, DATE_FORMAT).date()
+        _parsed_date_cache[date_str] = parsed
+    return parsed
+
 def parse_date(date_str: str) -> Optional[datetime.date]:
     """Safely parses a date string into a date object."""
     if not date_str: return None
     try:
-        return datetime.datetime.strptime(date_str.strip(), DATE_FORMAT).date()
+        return _parse_date_cached(date_str.strip())
     except ValueError:
         # Keep console warning, but don't show messagebox during bulk load
         # print(f"Warning: Invalid date format '{date_str}'. Treating as due.")
@@ -141,8 +205,13 @@ def _safe_int_parse(value_str: Optional[str], default: int) -> int:
     except (ValueError, TypeError): return default
 
 
-def load_deck(filepath: str) -> List[Dict[str, Any]]:
-    """Loads flashcards from a specific CSV file path, including new SRS fields."""
+def load_deck(filepath: str, show_error: Optional[Callable[[str, str], Any]] = None) -> List[Dict[str, Any]]:
+    """Loads flashcards from a specific CSV file path, including new SRS fields.
+
+    `show_error(title, message)` replaces messagebox.showerror, e.g. to collect errors when loading off the Tk thread.
+    """
+    if show_error is None: show_error = messagebox.showerror
+    filepath = sys.intern(filepath) # Shared by every card's 'deck_filepath' and by the app's path sets
     deck: List[Dict[str, Any]] = []
     if not os.path.exists(filepath): return []
 
@@ -152,53 +221,57 @@ def load_deck(filepath: str) -> List[Dict[str, Any]]:
     has_shown_date_warning = False # Show only one date format warning per file
 
     try:
-        with open(filepath, mode='r', newline='', encoding='utf-8-sig') as csvfile:
-            # Handle potential empty lines before header
-            first_line = csvfile.readline()
-            while first_line and not first_line.strip():
-                 first_line = csvfile.readline()
-            if not first_line: # File is effectively empty
-                 messagebox.showerror("Error", f"CSV file '{os.path.basename(filepath)}' appears to be empty or has no header.")
-                 return []
-            csvfile.seek(0) # Reset position after reading first line
-
-            reader = csv.DictReader(csvfile)
-            header = reader.fieldnames
-            if not header:
-                 messagebox.showerror("Error", f"CSV file '{os.path.basename(filepath)}' has no valid header.")
+        with open(filepath, mode='rb') as raw_file: # One read and one decode instead of many small text-mode reads
+            csv_text = raw_file.read().decode('utf-8-sig')
+        with io.StringIO(csv_text, newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            # The first non-blank row is the header (skips leading empty lines in a single pass, no seek/re-read)
+            header = next((row for row in reader if any(cell.strip() for cell in row)), None)
+            if not header: # File is effectively empty
+                 show_error("Error", f"CSV file '{os.path.basename(filepath)}' appears to be empty or has no header.")
                  return []
 
             if not required_columns.issubset(header):
                 missing = required_columns - set(header)
-                messagebox.showerror("Error", f"CSV file '{os.path.basename(filepath)}' is missing required columns: {', '.join(missing)}")
+                show_error("Error", f"CSV file '{os.path.basename(filepath)}' is missing required columns: {', '.join(missing)}")
                 return []
 
-            file_specific_fieldnames = list(header)
-
-            for i, row in enumerate(reader):
+            # Resolve column positions once; a repeated column name uses its last occurrence
+            column_index = {name: idx for idx, name in enumerate(header)}
+            idx_front = column_index['front']; idx_back = column_index['back']
+            idx_next_review = column_index['next_review_date']; idx_interval = column_index['interval_days']
+            idx_ease = column_index.get('ease_factor'); idx_lapses = column_index.get('lapses'); idx_reviews = column_index.get('reviews')
+            card_fields = {'id', 'front', 'back', 'next_review_date', 'interval_days', 'ease_factor', 'lapses', 'reviews',
+                           'next_review_ordinal', 'original_row_index', 'deck_filepath', '_dirty'}
+            extra_columns = [(name, idx) for name, idx in column_index.items() if name not in card_fields]
+            header_width = len(header)
+            # Card ID prefix: hashed once per file, and stable across runs (unlike the salted built-in hash())
+            id_prefix = hashlib.blake2b(filepath.encode('utf-8'), digest_size=6).hexdigest()
+
+            for i, row in enumerate(r for r in reader if r): # Blank lines are skipped without counting
                 line_num = i + 2
-                # Check for empty rows (DictReader might return rows with all None values)
-                if not any(row.values()):
+                # Check for empty rows (all cells empty)
+                if not any(row):
                      print(f"Warning: Skipping empty row {line_num} in '{os.path.basename(filepath)}'.")
                      continue
+                if len(row) < header_width: row += [None] * (header_width - len(row)) # Missing trailing cells read as None
 
                 try:
-                    # Basic HTML escaping for safety, might need more robust solution
-                    # if complex HTML is intended within cards
-                    front = html.escape(row.get('front', '').strip())
-                    back = html.escape(row.get('back', '').strip())
+                    # Stored as raw text; HTML escaping happens only when rendering (_generate_html_for_card)
+                    front = row[idx_front].strip()
+                    back = row[idx_back].strip()
                     if not front or not back:
                          print(f"Warning: Skipping row {line_num} in '{os.path.basename(filepath)}' due to missing front or back.")
                          continue
 
-                    next_review_date_str = row.get('next_review_date', '').strip()
-                    interval_str = row.get('interval_days', '').strip()
+                    next_review_date_str = row[idx_next_review].strip()
+                    interval_str = row[idx_interval].strip()
 
                     # Parse date with single warning per file
                     next_review_date = None
                     if next_review_date_str:
                         try:
-                            next_review_date = datetime.datetime.strptime(next_review_date_str, DATE_FORMAT).date()
+                            next_review_date = _parse_date_cached(next_review_date_str)
                         except ValueError:
                             if not has_shown_date_warning:
                                 print(f"Warning: Invalid date format '{next_review_date_str}' in '{os.path.basename(filepath)}' (row {line_num}). Subsequent invalid dates in this file will be treated as due today without further warning.")
@@ -219,19 +292,20 @@ def load_deck(filepath: str) -> List[Dict[str, Any]]:
                     if is_new_or_invalid_date:
                         next_review_date = datetime.date.today()
 
-                    ease_factor = _safe_float_parse(row.get('ease_factor'), DEFAULT_EASE_FACTOR)
-                    lapses = _safe_int_parse(row.get('lapses'), 0)
-                    reviews = _safe_int_parse(row.get('reviews'), 0)
+                    ease_factor = _safe_float_parse(row[idx_ease] if idx_ease is not None else None, DEFAULT_EASE_FACTOR)
+                    lapses = _safe_int_parse(row[idx_lapses] if idx_lapses is not None else None, 0)
+                    reviews = _safe_int_parse(row[idx_reviews] if idx_reviews is not None else None, 0)
                     ease_factor = max(MINIMUM_EASE_FACTOR, ease_factor)
 
                     # Assign a unique ID to each card for easier management in Treeview
                     # Use original row index + filepath hash for reasonable uniqueness
-                    card_id = f"{hash(filepath)}_{line_num}"
+                    card_id = f"{id_prefix}_{line_num}"
 
                     card = {
                         'id': card_id, # Unique identifier for this card session
                         'front': front, 'back': back,
                         'next_review_date': next_review_date,
+                        'next_review_ordinal': next_review_date.toordinal() if next_review_date else 0, # Integer form for due checks
                         'interval_days': round(interval_days, 2),
                         'ease_factor': round(ease_factor, 3),
                         'lapses': lapses,
@@ -241,31 +315,106 @@ def load_deck(filepath: str) -> List[Dict[str, Any]]:
                         '_dirty': False
                     }
 
-                    for field in file_specific_fieldnames:
-                        if field not in card and field in row:
-                             # Also escape extra fields if they might contain HTML characters
-                             card[field] = html.escape(row[field]) if isinstance(row[field], str) else row[field]
+                    for field, idx in extra_columns:
+                        card[field] = row[idx]
 
                     deck.append(card)
                 except Exception as e:
                     print(f"Warning: Error processing row {line_num} in '{os.path.basename(filepath)}': {e}")
 
     except Exception as e:
-        messagebox.showerror("Error", f"An unexpected error occurred while reading '{os.path.basename(filepath)}': {e}")
+        show_error("Error", f"An unexpected error occurred while reading '{os.path.basename(filepath)}': {e}")
         return []
 
     return deck
 
 
-def save_deck(filepath: str, deck_to_save: List[Dict[str, Any]]):
-    """Saves the provided list of cards back to the specified CSV file path, including new SRS fields."""
-    core_fields = ['front', 'back', 'next_review_date', 'interval_days']
-    srs_fields = ['ease_factor', 'lapses', 'reviews']
-    base_fieldnames = core_fields + srs_fields
+CSV_CORE_FIELDS = ['front', 'back', 'next_review_date', 'interval_days']
+CSV_SRS_FIELDS = ['ease_factor', 'lapses', 'reviews']
+CSV_INTERNAL_FIELDS = {'_dirty', 'deck_filepath', 'original_row_index', 'id', 'next_review_ordinal', '_lower_text'} # Never written to CSV
+
+def _card_to_csv_row(card: Dict[str, Any], fieldnames: List[str]) -> List[Any]:
+    """Converts a card dict into the list of values written to CSV, ordered by `fieldnames` (text fields stay raw)."""
+    review_date = card.get('next_review_date')
+    formatted = {
+        'next_review_date': review_date.strftime(DATE_FORMAT) if review_date else '',
+        'interval_days': str(round(card.get('interval_days', 0.0), 2)),
+        'ease_factor': str(round(card.get('ease_factor', DEFAULT_EASE_FACTOR), 3)),
+        'lapses': str(card.get('lapses', 0)),
+        'reviews': str(card.get('reviews', 0)),
+    }
+    return [formatted[field] if field in formatted else card.get(field, '') for field in fieldnames]
+
+def _card_lower_cache(card: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
+    """Returns (front, back, front_lower, back_lower, search_haystack), memoized on the card until the text changes."""
+    front = card.get('front', ''); back = card.get('back', '')
+    cached = card.get('_lower_text')
+    if cached is None or cached[0] is not front or cached[1] is not back: # Edits assign new strings
+        front_lower = front.lower(); back_lower = back.lower()
+        cached = card['_lower_text'] = (front, back, front_lower, back_lower, f"{front_lower}\0{back_lower}") # NUL can't be typed, so no match spans both
+    return cached
+
+def card_lower_text(card: Dict[str, Any]) -> Tuple[str, str]:
+    """Returns the card's (front, back) lowercased for search/sort."""
+    cached = _card_lower_cache(card)
+    return cached[2], cached[3]
+
+def card_search_haystack(card: Dict[str, Any]) -> str:
+    """Returns the card's lowercased front and back joined into one string, so a search is a single `in` check."""
+    return _card_lower_cache(card)[4]
+
+# Every loaded or added card carries these fields, so C-level itemgetters can stand in for lambdas
+# ("deck" is keyed by display name; see filter_and_sort_cards)
+_CARD_SORT_KEYS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "front": lambda card: _card_lower_cache(card)[2],
+    "back": lambda card: _card_lower_cache(card)[3],
+    "next_review": operator.itemgetter('next_review_ordinal'), # Same order as the date, and None-safe (0)
+    "interval": operator.itemgetter('interval_days'),
+    "ease": operator.itemgetter('ease_factor'),
+    "reviews": operator.itemgetter('reviews'),
+    "lapses": operator.itemgetter('lapses'),
+}
+
+def filter_and_sort_cards(cards: List[Dict[str, Any]], search_term: str, sort_column: Optional[str] = None, reverse: bool = False,
+                          deck_name_for: Optional[Callable[[str], str]] = None) -> List[Dict[str, Any]]:
+    """Returns the cards whose front/back contain `search_term` (lowercase), sorted by a card manager column.
+
+    `deck_name_for(path)` gives the deck names sorted on for the "deck" column (e.g. FlashcardApp._deck_name_for).
+    Pure Python with no Tk access, so it can run on a worker thread.
+    """
+    if search_term:
+        display_data = [card for card in cards if search_term in card_search_haystack(card)]
+    else:
+         display_data = cards[:] # Work with a copy
+
+    if sort_column == "deck":
+        if deck_name_for is None: deck_name_for = lambda path: os.path.splitext(os.path.basename(path))[0]
+        key_func = lambda card: deck_name_for(card['deck_filepath'])
+    else:
+        key_func = _CARD_SORT_KEYS.get(sort_column) if sort_column else None
+    if key_func:
+         try: display_data.sort(key=key_func, reverse=reverse)
+         except Exception as e: print(f"Error sorting column {sort_column}: {e}")
+    return display_data
+
+def deck_extra_keys(deck: List[Dict[str, Any]]) -> Set[str]:
+    """Returns the extra (non-core, non-internal) CSV columns used by the cards of a deck."""
     all_keys_in_data = set()
-    for card in deck_to_save: all_keys_in_data.update(card.keys())
-    internal_fields = {'_dirty', 'deck_filepath', 'original_row_index', 'id'} # Exclude internal fields
-    extra_fields = sorted([k for k in all_keys_in_data if k not in base_fieldnames and k not in internal_fields])
+    for card in deck: all_keys_in_data.update(card.keys())
+    return {k for k in all_keys_in_data if k not in CSV_CORE_FIELDS and k not in CSV_SRS_FIELDS and k not in CSV_INTERNAL_FIELDS}
+
+def save_deck(filepath: str, deck_to_save: List[Dict[str, Any]], extra_keys: Optional[Set[str]] = None,
+              show_error: Optional[Callable[[str, str], Any]] = None) -> bool:
+    """Saves the provided list of cards back to the specified CSV file path, including new SRS fields.
+
+    `extra_keys` (the deck's extra columns, if already known) avoids scanning every card for them.
+    `show_error(title, message)` replaces messagebox.showerror, as in load_deck. Returns True if the file was written.
+    """
+    if show_error is None: show_error = messagebox.showerror
+    core_fields = CSV_CORE_FIELDS
+    base_fieldnames = CSV_CORE_FIELDS + CSV_SRS_FIELDS
+    if extra_keys is None: extra_keys = deck_extra_keys(deck_to_save)
+    extra_fields = sorted(k for k in extra_keys if k not in base_fieldnames and k not in CSV_INTERNAL_FIELDS)
     potential_fieldnames = base_fieldnames + extra_fields
     final_fieldnames = potential_fieldnames
 
@@ -274,8 +423,9 @@ def save_deck(filepath: str, deck_to_save: List[Dict[str, Any]]):
             with open(filepath, mode='r', newline='', encoding='utf-8-sig') as csvfile:
                 reader = csv.reader(csvfile)
                 header = next(reader, None)
-                if header and all(field in header for field in core_fields):
-                     newly_added_fields = [f for f in potential_fieldnames if f not in header]
+                header_fields = set(header) if header else set()
+                if header and header_fields.issuperset(core_fields):
+                     newly_added_fields = [f for f in potential_fieldnames if f not in header_fields]
                      final_fieldnames = header + newly_added_fields
                 # else: use potential_fieldnames (already set)
     except Exception as e:
@@ -286,45 +436,82 @@ def save_deck(filepath: str, deck_to_save: List[Dict[str, Any]]):
          if bf not in final_fieldnames: final_fieldnames.insert(0, bf)
 
     try:
+        buffer = io.StringIO() # Serialize in memory first so the file gets a single write
+        writer = csv.writer(buffer)
+        writer.writerow(final_fieldnames)
+        writer.writerows([_card_to_csv_row(card, final_fieldnames) for card in deck_to_save]) # One call into the C writer
         with open(filepath, mode='w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=final_fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            for card in deck_to_save:
-                row_to_write = card.copy()
-                # Unescape HTML before saving to CSV if it was escaped on load
-                if 'front' in row_to_write: row_to_write['front'] = html.unescape(row_to_write['front'])
-                if 'back' in row_to_write: row_to_write['back'] = html.unescape(row_to_write['back'])
-                # Handle other fields if they were escaped
-                for key, value in row_to_write.items():
-                    if isinstance(value, str) and key not in core_fields and key not in srs_fields and key not in internal_fields:
-                         row_to_write[key] = html.unescape(value)
-
-                row_to_write['next_review_date'] = row_to_write.get('next_review_date').strftime(DATE_FORMAT) if row_to_write.get('next_review_date') else ''
-                row_to_write['interval_days'] = str(round(row_to_write.get('interval_days', 0.0), 2))
-                row_to_write['ease_factor'] = str(round(row_to_write.get('ease_factor', DEFAULT_EASE_FACTOR), 3))
-                row_to_write['lapses'] = str(row_to_write.get('lapses', 0))
-                row_to_write['reviews'] = str(row_to_write.get('reviews', 0))
-                writer.writerow(row_to_write)
-                if '_dirty' in card: card['_dirty'] = False # Reset dirty flag after successful write
+            csvfile.write(buffer.getvalue())
+        for card in deck_to_save:
+            if '_dirty' in card: card['_dirty'] = False # Reset dirty flag after successful write
+        return True
     except IOError as e:
-        messagebox.showerror("Save Error", f"Could not write to file '{os.path.basename(filepath)}': {e}")
+        show_error("Save Error", f"Could not write to file '{os.path.basename(filepath)}': {e}")
     except Exception as e:
-        messagebox.showerror("Save Error", f"An unexpected error occurred while saving '{os.path.basename(filepath)}': {e}")
+        show_error("Save Error", f"An unexpected error occurred while saving '{os.path.basename(filepath)}': {e}")
+    return False
 
-def get_due_cards(deck: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Filters the deck (potentially combined) to find cards due for review today."""
-    today = datetime.date.today()
-    return [card for card in deck if card.get('next_review_date') is None or card.get('next_review_date') <= today]
+def append_cards_to_deck(filepath: str, new_cards: List[Dict[str, Any]]) -> bool:
+    """Appends new cards to the end of an existing deck CSV instead of rewriting the whole file.
 
-def update_card_schedule(card: Dict[str, Any], quality: int):
-    """Updates the card's interval, ease factor, and next review date using an SM-2 like algorithm."""
-    today = datetime.date.today()
-    old_interval = card.get('interval_days', 0.0)
-    old_ease_factor = card.get('ease_factor', DEFAULT_EASE_FACTOR)
-    old_lapses = card.get('lapses', 0)
-    old_reviews = card.get('reviews', 0)
-    old_next_review_date = card.get('next_review_date')
+    Returns False if the file is missing, has no usable header or the append failed; the caller should then fall back to save_deck.
+    No fsync is done here; durability is handled once at shutdown (see FlashcardApp.flush_all_pending).
+    """
+    if not new_cards: return True
+    try:
+        with open(filepath, mode='rb') as f:
+            header_line = f.readline()
+            f.seek(0, os.SEEK_END)
+            ends_with_newline = True
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                ends_with_newline = f.read(1) in (b'\n', b'\r')
+        header = next(csv.reader([header_line.decode('utf-8-sig')]), None)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Info: Could not read header from '{filepath}' for appending. Falling back to full save. Error: {e}")
+        return False
+    if not header or not all(field in header for field in CSV_CORE_FIELDS + CSV_SRS_FIELDS):
+        return False # Header would need new columns; only a full save can add them
 
+    try:
+        with open(filepath, mode='a', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            if not ends_with_newline: csvfile.write(writer.dialect.lineterminator) # Don't merge with the last row
+            writer.writerows([_card_to_csv_row(card, header) for card in new_cards])
+    except (OSError, csv.Error) as e: # The full save rewrites the file (dropping any partial row) and reports its own errors
+        print(f"Info: Could not append to '{filepath}'. Falling back to full save. Error: {e}")
+        return False
+    for card in new_cards: card['_dirty'] = False # Reset dirty flag after successful write
+    return True
+
+def _save_deck_collecting_errors(filepath: str, deck_snapshot: List[Dict[str, Any]], extra_keys: Optional[Set[str]]) -> Tuple[bool, List[Tuple[str, str]]]:
+    """Runs save_deck without touching Tk (safe on a worker thread); returns (saved, [(title, message), ...])."""
+    errors: List[Tuple[str, str]] = []
+    saved = save_deck(filepath, deck_snapshot, extra_keys, show_error=lambda title, message: errors.append((title, message)))
+    return saved, errors
+
+def _load_deck_collecting_errors(filepath: str, wait_for: Optional[List[concurrent.futures.Future]] = None) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+    """Runs load_deck without touching Tk (safe on a worker thread); returns (deck, [(title, message), ...]).
+
+    `wait_for` are in-flight saves that must finish before the file is read.
+    """
+    if wait_for: concurrent.futures.wait(wait_for)
+    errors: List[Tuple[str, str]] = []
+    deck = load_deck(filepath, show_error=lambda title, message: errors.append((title, message)))
+    return deck, errors
+
+def get_due_cards(deck: List[Dict[str, Any]], hot_columns: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Filters the deck (potentially combined) to find cards due for review today.
+
+    If `hot_columns` (from build_hot_columns, matching `deck`) is given, the filter runs on its ordinal array.
+    """
+    today_ord = datetime.date.today().toordinal()
+    if hot_columns is not None:
+        return [deck[i] for i in np.flatnonzero(hot_columns['ord'] <= today_ord).tolist()]
+    return [card for card in deck if card.get('next_review_ordinal', 0) <= today_ord] # 0 = no date, always due
+
+def _sm2_step(quality: int, old_interval: float, old_ease_factor: float, old_lapses: int, old_reviews: int) -> Tuple[float, float, int, int, float]:
+    """Pure SM-2 arithmetic: returns (interval, ease_factor, lapses, reviews, days_to_add) before rounding."""
     current_ease = max(MINIMUM_EASE_FACTOR, old_ease_factor)
     new_reviews = old_reviews + 1
     new_lapses = old_lapses
@@ -368,15 +555,29 @@ def update_card_schedule(card: Dict[str, Any], quality: int):
         days_to_add = max(MINIMUM_INTERVAL_DAYS, days_to_add)
         new_interval = max(MINIMUM_INTERVAL_DAYS, new_interval)
 
+    return new_interval, new_ease_factor, new_lapses, new_reviews, days_to_add
+
+def update_card_schedule(card: Dict[str, Any], quality: int):
+    """Updates the card's interval, ease factor, and next review date using an SM-2 like algorithm."""
+    today = datetime.date.today()
+    old_interval = card.get('interval_days', 0.0)
+    old_ease_factor = card.get('ease_factor', DEFAULT_EASE_FACTOR)
+    old_lapses = card.get('lapses', 0)
+    old_reviews = card.get('reviews', 0)
+    _store_schedule(card, today, *_sm2_step(quality, old_interval, old_ease_factor, old_lapses, old_reviews))
+
+def _store_schedule(card: Dict[str, Any], today: datetime.date, new_interval: float, new_ease_factor: float,
+                    new_lapses: int, new_reviews: int, days_to_add: float):
+    """Rounds an SM-2 step result and writes it into the card, marking it dirty only if something changed."""
     next_review_date = today + datetime.timedelta(days=int(days_to_add))
     new_interval_rounded = round(new_interval, 2)
     new_ease_factor_rounded = round(new_ease_factor, 3)
 
-    changed = (old_interval != new_interval_rounded or
-               old_ease_factor != new_ease_factor_rounded or
-               old_lapses != new_lapses or
-               old_reviews != new_reviews or
-               old_next_review_date != next_review_date)
+    changed = (card.get('interval_days', 0.0) != new_interval_rounded or
+               card.get('ease_factor', DEFAULT_EASE_FACTOR) != new_ease_factor_rounded or
+               card.get('lapses', 0) != new_lapses or
+               card.get('reviews', 0) != new_reviews or
+               card.get('next_review_date') != next_review_date)
 
     if changed:
         card['interval_days'] = new_interval_rounded
@@ -384,38 +585,212 @@ def update_card_schedule(card: Dict[str, Any], quality: int):
         card['lapses'] = new_lapses
         card['reviews'] = new_reviews
         card['next_review_date'] = next_review_date
+        card['next_review_ordinal'] = next_review_date.toordinal()
         card['_dirty'] = True
     else:
          card['_dirty'] = card.get('_dirty', False)
 
-def find_decks(decks_dir: str) -> List[str]:
-    """Finds all .csv files in the specified directory, creates dir if needed."""
-    if not os.path.isdir(decks_dir):
+def bulk_update_schedule(cards: List[Dict[str, Any]], quality: int):
+    """Applies the same rating to many cards at once (e.g. after an import). Same results as calling
+    update_card_schedule on each card, but the SM-2 maths runs vectorized when NumPy is available.
+
+    Only the card dicts are updated; for cards of the loaded decks call FlashcardApp.bulk_rate_cards instead,
+    which also marks their files for saving and refreshes the app's cached views (as rate_card does).
+    """
+    if not cards: return
+    if not NUMPY_AVAILABLE:
+        for card in cards: update_card_schedule(card, quality)
+        return
+    today = datetime.date.today()
+    n = len(cards)
+    iv = np.fromiter((c.get('interval_days', 0.0) for c in cards), dtype=np.float64, count=n)
+    ea = np.fromiter((c.get('ease_factor', DEFAULT_EASE_FACTOR) for c in cards), dtype=np.float64, count=n)
+    lp = np.fromiter((c.get('lapses', 0) for c in cards), dtype=np.int64, count=n)
+    rv = np.fromiter((c.get('reviews', 0) for c in cards), dtype=np.int64, count=n)
+
+    current_ease = np.maximum(MINIMUM_EASE_FACTOR, ea)
+    new_reviews = rv + 1
+    new_lapses = lp + 1 if quality == 1 else lp
+
+    if quality == 1: # Again (Lapse)
+        new_ease = np.maximum(MINIMUM_EASE_FACTOR, current_ease + EASE_MODIFIER_AGAIN)
+        if LAPSE_INTERVAL_FACTOR > 0: days = np.ceil(iv * LAPSE_INTERVAL_FACTOR)
+        else: days = np.full(n, float(LAPSE_NEW_INTERVAL_DAYS))
+        days = np.maximum(1, days)
+    else: # Hard, Good, Easy
+        learning = (iv < MINIMUM_INTERVAL_DAYS) | (rv <= 0)
+        graduated_days = np.ceil(iv * current_ease)
+        if quality == 2: # Hard
+            new_ease = np.maximum(MINIMUM_EASE_FACTOR, current_ease + EASE_MODIFIER_HARD)
+            learning_days = 1; graduated_days = np.ceil(iv * INTERVAL_MODIFIER_HARD)
+        elif quality == 3: # Good
+            new_ease = current_ease; learning_days = INITIAL_INTERVAL_DAYS
+        elif quality == 4: # Easy
+            new_ease = current_ease + EASE_MODIFIER_EASY
+            learning_days = 4; graduated_days = np.ceil(graduated_days * INTERVAL_MODIFIER_EASY_BONUS)
+        else:
+            new_ease = current_ease; learning_days = 0
+        if quality != 2: graduated_days = np.maximum(graduated_days, iv + 1)
+        days = np.where(learning, float(learning_days), graduated_days)
+        if quality > 1: days = np.maximum(MINIMUM_INTERVAL_DAYS, days)
+
+    # Scatter back as Python scalars so rounding and comparisons match the single-card path exactly
+    for card, interval_days, ease, lapses, reviews in zip(cards, days.tolist(), new_ease.tolist(), new_lapses.tolist(), new_reviews.tolist()):
+        _store_schedule(card, today, interval_days, ease, lapses, reviews, interval_days)
+
+_deck_listing_cache: Dict[str, Tuple[int, List[str]]] = {} # decks_dir -> (dir mtime_ns, sorted .csv names)
+
+def find_decks(decks_dir: str, show_error: Optional[Callable[[str, str], Any]] = None) -> List[str]:
+    """Finds all .csv files in the specified directory, creates dir if needed.
+
+    `show_error(title, message)` replaces messagebox.showerror, as in load_deck.
+    """
+    if show_error is None: show_error = messagebox.showerror
+    # Attempt creation directly (one syscall, no exists/create race); an existing dir is the common case
+    try:
+        os.makedirs(decks_dir)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        show_error("Error", f"Could not create directory '{decks_dir}': {e}")
+        return []
+    else:
+        print(f"Created decks directory: '{decks_dir}'")
+        dummy_path = os.path.join(decks_dir, "example_deck.csv")
         try:
-            os.makedirs(decks_dir)
-            print(f"Created decks directory: '{decks_dir}'")
-            dummy_path = os.path.join(decks_dir, "example_deck.csv")
-            if not os.path.exists(dummy_path):
-                 with open(dummy_path, 'w', newline='', encoding='utf-8') as f:
-                      writer = csv.writer(f)
-                      writer.writerow(['front', 'back', 'next_review_date', 'interval_days', 'ease_factor', 'lapses', 'reviews'])
-                      writer.writerow(['Sample Question: What is $E=mc^2$? Requires tkinterweb now.', 'Sample Answer: $$E=mc^2$$', '', '', str(DEFAULT_EASE_FACTOR), '0', '0'])
-                      writer.writerow(['Regular Text', 'Another plain card.', '', '', str(DEFAULT_EASE_FACTOR), '0', '0'])
-                 print(f"Created '{dummy_path}'. Please replace it with your actual decks.")
-            return ["example_deck.csv"]
+            with open(dummy_path, 'x', newline='', encoding='utf-8') as f:
+                 writer = csv.writer(f)
+                 writer.writerow(['front', 'back', 'next_review_date', 'interval_days', 'ease_factor', 'lapses', 'reviews'])
+                 writer.writerow(['Sample Question: What is $E=mc^2$? Requires tkinterweb now.', 'Sample Answer: $$E=mc^2$$', '', '', str(DEFAULT_EASE_FACTOR), '0', '0'])
+                 writer.writerow(['Regular Text', 'Another plain card.', '', '', str(DEFAULT_EASE_FACTOR), '0', '0'])
+            print(f"Created '{dummy_path}'. Please replace it with your actual decks.")
         except OSError as e:
-            messagebox.showerror("Error", f"Could not create directory '{decks_dir}': {e}")
+            show_error("Error", f"Could not create example deck '{dummy_path}': {e}")
             return []
+        return ["example_deck.csv"]
     try:
-        csv_files = [f for f in os.listdir(decks_dir)
-                     if os.path.isfile(os.path.join(decks_dir, f)) and f.lower().endswith('.csv')]
-        return sorted(csv_files)
+        dir_mtime_ns = os.stat(decks_dir).st_mtime_ns # Changes whenever an entry is added, removed or renamed
+        cached = _deck_listing_cache.get(decks_dir)
+        if cached and cached[0] == dir_mtime_ns: return list(cached[1])
+        with os.scandir(decks_dir) as entries: # DirEntry caches the file type, no stat per entry
+            csv_files = sorted(e.name for e in entries if e.name.lower().endswith('.csv') and e.is_file())
+        _deck_listing_cache[decks_dir] = (dir_mtime_ns, csv_files)
+        return list(csv_files)
     except OSError as e:
-        messagebox.showerror("Error", f"Error accessing decks directory '{decks_dir}': {e}")
+        show_error("Error", f"Error accessing decks directory '{decks_dir}': {e}")
         return []
 
-def calculate_deck_statistics(deck_data: List[Dict[str, Any]], forecast_days: int = STATS_FORECAST_DAYS) -> Dict[str, Any]:
-    """Calculates various statistics for the provided deck data, including SRS stats."""
+def _find_decks_collecting_errors(decks_dir: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Runs find_decks without touching Tk (safe on a worker thread); returns (csv_files, [(title, message), ...])."""
+    errors: List[Tuple[str, str]] = []
+    csv_files = find_decks(decks_dir, show_error=lambda title, message: errors.append((title, message)))
+    return csv_files, errors
+
+def build_hot_columns(deck: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Builds a struct-of-arrays view of the SRS fields used by due filtering and statistics.
+
+    Returns None when NumPy is unavailable. 'ord' holds the next review date as an ordinal (0 = no date),
+    'index' maps id(card) to its row so single cards can be updated in place (see update_hot_columns).
+    """
+    if not NUMPY_AVAILABLE: return None
+    n = len(deck)
+    return {
+        'source': deck, 'size': n, # Used by the owner to detect added/removed cards
+        'index': {id(card): i for i, card in enumerate(deck)},
+        'ord': np.fromiter((c.get('next_review_ordinal', 0) for c in deck), dtype=np.int64, count=n),
+        'interval': np.fromiter((c.get('interval_days', 0.0) for c in deck), dtype=np.float64, count=n),
+        'ease': np.fromiter((c.get('ease_factor', DEFAULT_EASE_FACTOR) for c in deck), dtype=np.float64, count=n),
+        'reviews': np.fromiter((c.get('reviews', 0) for c in deck), dtype=np.int64, count=n),
+        'lapses': np.fromiter((c.get('lapses', 0) for c in deck), dtype=np.int64, count=n),
+    }
+
+def update_hot_columns(hot_columns: Optional[Dict[str, Any]], card: Dict[str, Any]):
+    """Writes a single card's (possibly rescheduled) SRS fields back into its row of the hot columns."""
+    if hot_columns is None: return
+    i = hot_columns['index'].get(id(card))
+    if i is None: return
+    hot_columns['ord'][i] = card.get('next_review_ordinal', 0)
+    hot_columns['interval'][i] = card.get('interval_days', 0.0)
+    hot_columns['ease'][i] = card.get('ease_factor', DEFAULT_EASE_FACTOR)
+    hot_columns['reviews'][i] = card.get('reviews', 0)
+    hot_columns['lapses'][i] = card.get('lapses', 0)
+
+def build_due_heap(deck: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Builds a min-heap of (next_review_ordinal, seq, card) so due queries only touch newly due cards.
+
+    'due' maps id(card) to cards already popped as due; entries whose ordinal no longer matches the card are stale and skipped.
+    """
+    heap = [(card.get('next_review_ordinal', 0), i, card) for i, card in enumerate(deck)]
+    heapq.heapify(heap)
+    return {'source': deck, 'size': len(deck), 'heap': heap, 'due': {}, 'seq': len(deck)}
+
+def push_due_heap(due_heap: Optional[Dict[str, Any]], card: Dict[str, Any]):
+    """Re-queues a card after its schedule changed (its old entry goes stale)."""
+    if due_heap is None: return
+    due_heap['due'].pop(id(card), None)
+    heapq.heappush(due_heap['heap'], (card.get('next_review_ordinal', 0), due_heap['seq'], card))
+    due_heap['seq'] += 1
+
+def get_due_cards_fast(due_heap: Dict[str, Any], today_ord: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Heap-backed equivalent of get_due_cards: pops entries due by `today_ord` (default today) into the due set."""
+    if today_ord is None: today_ord = datetime.date.today().toordinal()
+    heap = due_heap['heap']; due = due_heap['due']; heappop = heapq.heappop
+    while heap and heap[0][0] <= today_ord:
+        card_ord, _, card = heappop(heap)
+        if card.get('next_review_ordinal', 0) == card_ord: due[id(card)] = card # Skip stale entries
+    return list(due.values())
+
+def _accumulate_statistics_numpy(hot_columns: Dict[str, Any], stats: Dict[str, Any], today: datetime.date, forecast_days: int,
+                                 learning_interval_threshold: float, young_interval_threshold: float,
+                                 interval_bins: List[float], interval_labels: List[str],
+                                 ease_bins: List[float], ease_labels: List[str]) -> Tuple[float, float, int, float, int, List[int]]:
+    """Vectorized equivalent of the per-card loop in calculate_deck_statistics. Fills `stats` in place and returns
+    (total_interval_all, total_interval_mature, mature_card_count, total_ease, non_new_card_count, forecast_counts),
+    where forecast_counts[i] is the number of cards due i days from today."""
+    intervals = hot_columns['interval']; eases = hot_columns['ease']
+    lapses = hot_columns['lapses']; reviews = hot_columns['reviews']
+    has_date = hot_columns['ord'] > 0
+    days_until = hot_columns['ord'] - today.toordinal() # Only meaningful where has_date
+
+    is_new = reviews == 0; is_seen = ~is_new
+    stats["total_reviews"] = int(reviews.sum()); stats["total_lapses"] = int(lapses.sum())
+    stats["lapsed_card_count"] = int(np.count_nonzero(lapses > 0))
+    seen_intervals = intervals[is_seen]; non_new_card_count = int(seen_intervals.size)
+    total_interval_all = float(seen_intervals.sum()); total_ease = float(eases[is_seen].sum())
+    if non_new_card_count > 0: stats["longest_interval"] = max(stats["longest_interval"], float(seen_intervals.max()))
+    below_learning = intervals < learning_interval_threshold; below_young = intervals < young_interval_threshold
+    is_mature = is_seen & ~below_learning & ~below_young
+    stats["new_cards"] = int(np.count_nonzero(is_new))
+    stats["learning_cards"] = int(np.count_nonzero(is_seen & below_learning))
+    stats["young_cards"] = int(np.count_nonzero(is_seen & ~below_learning & below_young))
+    mature_card_count = int(np.count_nonzero(is_mature)); total_interval_mature = float(intervals[is_mature].sum())
+    stats["mature_cards"] = mature_card_count
+
+    # Interval bins: 0 -> first label, bins[i] < interval <= bins[i+1] -> label i+1
+    interval_idx = np.searchsorted(interval_bins, intervals[intervals >= 0], side='left')
+    for label, count in zip(interval_labels, np.bincount(interval_idx, minlength=len(interval_labels)).tolist()):
+        if count: stats["cards_by_interval_range"][label] += count
+    # Ease bins (seen cards only): bins[i] <= ease < bins[i+1] -> label i, anything past the last bin -> last label
+    seen_eases = eases[is_seen]; seen_eases = seen_eases[seen_eases >= 0]
+    ease_idx = np.minimum(np.searchsorted(ease_bins, seen_eases, side='right') - 1, len(ease_labels) - 1)
+    for label, count in zip(ease_labels, np.bincount(ease_idx, minlength=len(ease_labels)).tolist()):
+        if count: stats["ease_distribution"][label] += count
+
+    undated_new_count = int(np.count_nonzero(~has_date & is_new)) # New cards without a date are due today
+    stats["due_today"] = int(np.count_nonzero(has_date & (days_until <= 0))) + undated_new_count
+    stats["due_tomorrow"] = int(np.count_nonzero(has_date & (days_until == 1)))
+    stats["due_next_7_days"] = int(np.count_nonzero(has_date & (days_until >= 1) & (days_until <= 7)))
+    in_forecast = has_date & (days_until >= 0) & (days_until <= forecast_days)
+    forecast_counts = np.bincount(days_until[in_forecast], minlength=forecast_days + 1)
+    forecast_counts[0] += undated_new_count
+    return total_interval_all, total_interval_mature, mature_card_count, total_ease, non_new_card_count, forecast_counts.tolist()
+
+def calculate_deck_statistics(deck_data: List[Dict[str, Any]], forecast_days: int = STATS_FORECAST_DAYS,
+                              hot_columns: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Calculates various statistics for the provided deck data, including SRS stats.
+
+    `hot_columns` (from build_hot_columns, matching deck_data) avoids rebuilding the arrays on every call.
+    """
     stats = {
         "total_cards": 0, "new_cards": 0, "learning_cards": 0, "young_cards": 0, "mature_cards": 0,
         "due_today": 0, "due_tomorrow": 0, "due_next_7_days": 0, "due_counts_forecast": defaultdict(int),
@@ -438,35 +813,49 @@ def calculate_deck_statistics(deck_data: List[Dict[str, Any]], forecast_days: in
     ease_bins = [0, 1.3, 1.5, 1.8, 2.0, 2.2, 2.4, 2.6, 2.8, 3.0, float('inf')]
     ease_labels = ["<1.3", "1.3-1.5", "1.5-1.8", "1.8-2.0", "2.0-2.2", "2.2-2.4", "2.4-2.6", "2.6-2.8", "2.8-3.0", ">3.0"]
 
-    for card in deck_data:
-        review_date = card.get('next_review_date'); interval = card.get('interval_days', 0.0)
-        ease = card.get('ease_factor', DEFAULT_EASE_FACTOR); lapses = card.get('lapses', 0); reviews = card.get('reviews', 0)
-        is_new = reviews == 0
-        stats["total_reviews"] += reviews; stats["total_lapses"] += lapses
-        if lapses > 0: stats["lapsed_card_count"] += 1
-        if not is_new:
-            total_interval_all += interval; total_ease += ease; non_new_card_count += 1
-            stats["longest_interval"] = max(stats["longest_interval"], interval)
-        if is_new: stats["new_cards"] += 1
-        elif interval < learning_interval_threshold: stats["learning_cards"] += 1
-        elif interval < young_interval_threshold: stats["young_cards"] += 1
-        else: stats["mature_cards"] += 1; total_interval_mature += interval; mature_card_count += 1
-        bin_found = False
-        for i in range(len(interval_bins) - 1):
-            if interval == 0 and interval_bins[i] == 0: stats["cards_by_interval_range"][interval_labels[0]] += 1; bin_found = True; break
-            elif interval_bins[i] < interval <= interval_bins[i+1]: stats["cards_by_interval_range"][interval_labels[i+1]] += 1; bin_found = True; break
-        if not bin_found and interval > interval_bins[-2]: stats["cards_by_interval_range"][interval_labels[-1]] += 1
-        if not is_new:
-             bin_found = False
-             for i in range(len(ease_bins) - 1):
-                  if ease_bins[i] <= ease < ease_bins[i+1]: stats["ease_distribution"][ease_labels[i]] += 1; bin_found = True; break
-             if not bin_found and ease >= ease_bins[-2]: stats["ease_distribution"][ease_labels[-1]] += 1
-        if review_date:
-            if review_date <= forecast_end_date and review_date >= today: stats["due_counts_forecast"][review_date] += 1
-            if review_date <= today: stats["due_today"] += 1
-            if review_date == tomorrow: stats["due_tomorrow"] += 1
-            if next_7_days_start <= review_date <= next_7_days_end: stats["due_next_7_days"] += 1
-        elif is_new: stats["due_today"] += 1; stats["due_counts_forecast"][today] += 1
+    if NUMPY_AVAILABLE: # Vectorized path; the loop below is the pure-Python fallback
+        if hot_columns is None: hot_columns = build_hot_columns(deck_data)
+        (total_interval_all, total_interval_mature, mature_card_count, total_ease, non_new_card_count, forecast_counts) = _accumulate_statistics_numpy(
+            hot_columns, stats, today, forecast_days, learning_interval_threshold, young_interval_threshold,
+            interval_bins, interval_labels, ease_bins, ease_labels)
+    else:
+        interval_bin_indices = []; ease_bin_indices = [] # Counted once after the loop
+        add_interval_bin = interval_bin_indices.append; add_ease_bin = ease_bin_indices.append
+        bisect_left = bisect.bisect_left; bisect_right = bisect.bisect_right; last_ease_bin = len(ease_labels) - 1
+        default_ease = DEFAULT_EASE_FACTOR; today_ord = today.toordinal()
+        forecast_counts = [0] * (forecast_days + 1) # Indexed by days from today
+        # Counters live in locals during the loop (fast local access) and are stored into stats afterwards
+        total_reviews = total_lapses = lapsed_card_count = 0
+        new_cards = learning_cards = young_cards = mature_cards = 0
+        due_today = due_tomorrow = due_next_7_days = 0; longest_interval = stats["longest_interval"]
+        for card in deck_data:
+            get = card.get
+            review_date = get('next_review_date'); interval = get('interval_days', 0.0)
+            ease = get('ease_factor', default_ease); lapses = get('lapses', 0); reviews = get('reviews', 0)
+            is_new = reviews == 0
+            total_reviews += reviews; total_lapses += lapses
+            if lapses > 0: lapsed_card_count += 1
+            if not is_new:
+                total_interval_all += interval; total_ease += ease; non_new_card_count += 1
+                longest_interval = max(longest_interval, interval)
+            if is_new: new_cards += 1
+            elif interval < learning_interval_threshold: learning_cards += 1
+            elif interval < young_interval_threshold: young_cards += 1
+            else: mature_cards += 1; total_interval_mature += interval; mature_card_count += 1
+            # Interval bins are right-closed (0 has its own bin); ease bins are left-closed, the last one open-ended
+            if interval >= 0: add_interval_bin(bisect_left(interval_bins, interval))
+            if not is_new and ease >= 0: add_ease_bin(min(bisect_right(ease_bins, ease) - 1, last_ease_bin))
+            if review_date:
+                if review_date <= forecast_end_date and review_date >= today: forecast_counts[review_date.toordinal() - today_ord] += 1
+                if review_date <= today: due_today += 1
+                if review_date == tomorrow: due_tomorrow += 1
+                if next_7_days_start <= review_date <= next_7_days_end: due_next_7_days += 1
+            elif is_new: due_today += 1; forecast_counts[0] += 1
+        stats.update(total_reviews=total_reviews, total_lapses=total_lapses, lapsed_card_count=lapsed_card_count,
+                     new_cards=new_cards, learning_cards=learning_cards, young_cards=young_cards, mature_cards=mature_cards,
+                     due_today=due_today, due_tomorrow=due_tomorrow, due_next_7_days=due_next_7_days, longest_interval=longest_interval)
+        for i, count in Counter(interval_bin_indices).items(): stats["cards_by_interval_range"][interval_labels[i]] = count
+        for i, count in Counter(ease_bin_indices).items(): stats["ease_distribution"][ease_labels[i]] = count
 
     if non_new_card_count > 0:
         stats["average_ease"] = round(total_ease / non_new_card_count, 2)
@@ -475,28 +864,50 @@ def calculate_deck_statistics(deck_data: List[Dict[str, Any]], forecast_days: in
     if stats["total_cards"] > 0:
         stats["average_reviews_per_card"] = round(stats["total_reviews"] / stats["total_cards"], 1)
         stats["average_lapses_per_card"] = round(stats["total_lapses"] / stats["total_cards"], 1)
-    full_forecast = {today + datetime.timedelta(days=i): stats["due_counts_forecast"].get(today + datetime.timedelta(days=i), 0) for i in range(forecast_days + 1)}
-    stats["due_counts_forecast"] = dict(sorted(full_forecast.items()))
+    forecast_start = today.toordinal() # Date keys are only materialised here, already in order
+    stats["due_counts_forecast"] = {datetime.date.fromordinal(forecast_start + i): count for i, count in enumerate(forecast_counts)}
     stats["cards_by_interval_range"] = dict(sorted(stats["cards_by_interval_range"].items(), key=lambda item: interval_labels.index(item[0])))
     stats["ease_distribution"] = dict(sorted(stats["ease_distribution"].items(), key=lambda item: ease_labels.index(item[0])))
     return stats
 
 
 # --- Helper to generate HTML ---
+_KATEX_CONTENT_SLOT = "<div>{content}</div>"
+_katex_template_parts: Dict[Tuple[str, str, int], Tuple[str, str]] = {} # (text, bg, size) -> (prefix, suffix)
+
+def _get_katex_template_parts(text_color: str, bg_color: str, font_size: int) -> Tuple[str, str]:
+    """Returns KATEX_HTML_TEMPLATE formatted for the given theme, split around the content slot (cached)."""
+    key = (text_color, bg_color, font_size)
+    parts = _katex_template_parts.get(key)
+    if parts is None:
+        prefix, suffix = KATEX_HTML_TEMPLATE.split(_KATEX_CONTENT_SLOT)
+        parts = (prefix.format(text_color=text_color, bg_color=bg_color, font_size=font_size, katex_base=KATEX_ASSET_BASE), suffix.format())
+        _katex_template_parts[key] = parts
+    return parts
+
+def clear_katex_template_cache():
+    """Drops the per-theme template variants (called when the appearance mode changes)."""
+    _katex_template_parts.clear()
+
+_HTML_SPECIAL_CHARS_RE = re.compile(r'[&<>]')
+
+def _fast_escape(text: str) -> str:
+    """html.escape for element content, returning text without &<> (the common case) as-is after a single scan."""
+    # Quotes need no escaping in element content
+    return html.escape(text, quote=False) if _HTML_SPECIAL_CHARS_RE.search(text) else text
+
 def _generate_html_for_card(content: str, text_color: str, bg_color: str, font_size: int = 16) -> str:
-    """Generates HTML string with KaTeX rendering for the given content and theme."""
-    # Basic check if content is just placeholder/error
-    is_placeholder = "[Math Render Error]" in content or "Select deck(s)" in content or "No decks found" in content
-    # Replace newline characters with <br> tags for HTML display
-    formatted_content = content.replace('\n', '<br>')
-
-    # Apply template
-    return KATEX_HTML_TEMPLATE.format(
-        content=formatted_content,
-        text_color=text_color,
-        bg_color=bg_color,
-        font_size=font_size
-    )
+    """Generates HTML string with KaTeX rendering for the given raw text content and theme."""
+    # Escape the raw text (KaTeX reads the decoded text, so math is unaffected), then turn newlines into <br> tags
+    formatted_content = _fast_escape(content).replace('\n', '<br>')
+
+    # Apply template (pre-formatted per theme, so only the content is concatenated here)
+    prefix, suffix = _get_katex_template_parts(text_color, bg_color, font_size)
+    return f"{prefix}<div>{formatted_content}</div>{suffix}"
+
+def _get_textbox_text(entry) -> str:
+    """Returns a textbox's text without the trailing newline Tk always adds ("end-1c"), stripped of surrounding whitespace."""
+    return entry.get("1.0", "end-1c").strip()
 
 # --- GUI Application Class ---
 
@@ -511,15 +922,42 @@ class FlashcardApp(ctk.CTk):
 
         # --- Data Attributes ---
         self.decks_dir = DECKS_DIR
-        self.available_decks: List[str] = []
+        self.available_decks: List[Dict[str, str]] = [] # One record per deck file: {'file', 'name', 'path'}
         self.current_deck_paths: List[str] = []
         self.deck_data: List[Dict[str, Any]] = [] # Combined data from loaded decks
-        self.due_cards: List[Dict[str, Any]] = []
-        self.current_card_index: int = -1
+        self._card_by_id: Dict[str, Dict[str, Any]] = {} # deck_data indexed by card id (see _index_card)
+        self._deck_data_version: int = 0 # Bumped whenever cards are added, removed, edited or rescheduled
+        self._deckname_cache: Dict[str, str] = {} # Deck file path -> display name (see _deck_name_for)
+        self._next_id_seq = itertools.count(start=int(time.time() * 1000)) # Ids for new cards: unique even within one millisecond
+        self.due_cards: Deque[Dict[str, Any]] = deque() # Review queue; due_cards[0] is the current card
+        self._reviewed_count: int = 0 # Cards rated (other than 'Again') this session, for progress display
         self.showing_answer: bool = False
         self._is_review_active: bool = False
+        self._html_cache: "OrderedDict[Tuple[str, str, str, int], str]" = OrderedDict() # LRU of generated card/message HTML
+        self._pending_html: Dict[Any, str] = {} # HtmlFrame -> latest HTML waiting to be loaded
+        self._last_html_per_frame: Dict[Any, str] = {} # HtmlFrame -> HTML it currently shows
+        self._html_flush_after_id: Optional[str] = None # Pending after_idle that loads _pending_html
+        self._prewarm_after_id: Optional[str] = None # Pending after_idle that fills _html_cache ahead of display
+        self._input_focus_by_type: Dict[type, bool] = {} # Widget class -> whether it takes text input (see _shortcuts_blocked)
+        self._prev_theme_tuple: Optional[Tuple[str, ...]] = None # Colors from the last _update_theme_colors, to detect real changes
         self._update_theme_colors() # Initialize theme colors
         self.files_needing_full_save: Set[str] = set() # Track files needing rewrite due to deletion
+        self._dirty_files: Set[str] = set() # Files with modified (rated/edited) cards since the last save
+        self._extra_keys_by_deck: Dict[str, Set[str]] = {} # Extra CSV columns per loaded file (passed to save_deck)
+        self._deck_executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="deck-loader")
+        self._deck_load_futures: Optional[List[concurrent.futures.Future]] = None # In-flight load_selected_decks, if any
+        self._deck_listing_future: Optional[concurrent.futures.Future] = None # In-flight find_decks scan, if any
+        self._save_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="deck-saver") # One writer keeps writes in order
+        self._card_list_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="card-list") # Card manager filter/sort
+        self._save_futures: Dict[concurrent.futures.Future, str] = {} # In-flight deck rewrites -> file path
+        self._save_poll_after_id: Optional[str] = None # Pending _check_save_futures poll
+        self._pending_flush_id: Optional[str] = None # Pending debounced save after card adds/edits (see _schedule_flush)
+        self._pending_appends: Dict[str, List[Dict[str, Any]]] = defaultdict(list) # New cards to append per file
+        self._unsynced_files: Set[str] = set() # Files written since the last fsync (synced on close)
+        self._hot_columns: Optional[Dict[str, Any]] = None # NumPy view of deck_data's SRS fields (see _get_hot_columns)
+        self._due_heap: Optional[Dict[str, Any]] = None # Incremental due-date heap over deck_data (see _get_due_cards)
+        self._status_clear_after_id: Optional[str] = None # Pending auto-clear of a transient status message
+        self._due_count_after_id: Optional[str] = None # Pending coalesced due-count refresh (see _request_due_count_update)
 
         # --- UI Elements References ---
         self.front_html_frame: Optional[tkinterweb.HtmlFrame] = None
@@ -528,19 +966,40 @@ class FlashcardApp(ctk.CTk):
         self.top_frame: Optional[ctk.CTkFrame] = None
         self.deck_label: Optional[ctk.CTkLabel] = None
         self.deck_listbox: Optional[tk.Listbox] = None
-        # ... other UI elements ...
+        self.load_button: Optional[ctk.CTkButton] = None
+        self.add_card_button: Optional[ctk.CTkButton] = None
+        self.manage_cards_button: Optional[ctk.CTkButton] = None
+        self.stats_button: Optional[ctk.CTkButton] = None
+        self.front_label: Optional[ctk.CTkLabel] = None # Fallback widgets, only created without tkinterweb
+        self.back_label: Optional[ctk.CTkLabel] = None
+        self.fallback_label: Optional[ctk.CTkLabel] = None # Only created with tkinterweb
+        self.show_answer_button: Optional[ctk.CTkButton] = None
+        self.rating_frame: Optional[ctk.CTkFrame] = None
+        self.good_button: Optional[ctk.CTkButton] = None
         self.status_label: Optional[ctk.CTkLabel] = None
         self.cards_due_label: Optional[ctk.CTkLabel] = None
+        # Packed state of the review widgets, tracked here to avoid a winfo_ismapped() Tcl round-trip per check
+        self._front_frame_packed: bool = False; self._back_frame_packed: bool = False
+        self._rating_frame_packed: bool = False; self._show_answer_packed: bool = False
+        self.status_var: Optional[tk.StringVar] = None # Text of status_label (set() is cheaper than configure(text=...))
+        self.cards_due_var: Optional[tk.StringVar] = None # Text of cards_due_label
 
 
         # --- Window References ---
         self.add_card_window: Optional[ctk.CTkToplevel] = None
+        self._add_card_visible: bool = False # add_card_window is withdrawn, not destroyed, when closed
+        self._add_card_front_entry: Optional[ctk.CTkTextbox] = None; self._add_card_back_entry: Optional[ctk.CTkTextbox] = None
+        self._add_card_target_path: Optional[str] = None; self._add_card_manage_ref = None
         self.edit_card_window: Optional[ctk.CTkToplevel] = None
-        self.manage_cards_window: Optional[ManageCardsWindow] = None # Type hint added
+        self._manage_cards_window_ref: Optional["weakref.ref[ManageCardsWindow]"] = None # See the manage_cards_window property
         self.settings_window: Optional[ctk.CTkToplevel] = None
         self.stats_window: Optional[ctk.CTkToplevel] = None
         self.stats_figure_canvas: Optional[FigureCanvasTkAgg] = None
         self.stats_toolbar: Optional[NavigationToolbar2Tk] = None
+        self.stats_plot_frame: Optional[ctk.CTkFrame] = None # Container of the forecast chart while the stats window is open
+        self._stats_chart: Optional[Dict[str, Any]] = None # Figure, axes and artists of the open forecast chart
+        self._stats_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None # (_stats_key(), stats) of the last calculation
+        self._stats_chart_cache: Optional[Dict[str, Any]] = None # Chart of the last closed stats window, reused if its data is current
 
         # --- UI Elements ---
         self._setup_ui() # Create all widgets
@@ -551,6 +1010,7 @@ class FlashcardApp(ctk.CTk):
 
         # Apply listbox colors *after* the main UI setup is complete
         self._update_listbox_colors()
+        self._configure_treeview_style() # Once here and on appearance changes, not per card manager open
 
         self.populate_deck_listbox() # Load initial deck list
 
@@ -564,9 +1024,16 @@ class FlashcardApp(ctk.CTk):
         self.top_frame.pack(pady=(5,10), padx=10, fill="x")
         self.deck_label = ctk.CTkLabel(self.top_frame, text="Available Decks (Ctrl/Shift+Click):")
         self.deck_label.pack(side="top", padx=5, pady=(0,5), anchor="w")
-        self.deck_listbox = tk.Listbox(self.top_frame, selectmode=tk.EXTENDED, height=5, exportselection=False,
+        # tk.Listbox keeps rows as plain strings and only draws the visible lines, so it stays cheap with many decks;
+        # the scrollbar makes long deck folders navigable within the fixed 5-row height
+        self.deck_list_frame = ctk.CTkFrame(self.top_frame, fg_color="transparent")
+        self.deck_list_frame.pack(side="top", fill="x", expand=True, padx=5)
+        self.deck_listbox = tk.Listbox(self.deck_list_frame, selectmode=tk.EXTENDED, height=5, exportselection=False,
                                        borderwidth=1, relief="solid", highlightthickness=0)
-        self.deck_listbox.pack(side="top", fill="x", expand=True, padx=5)
+        self.deck_list_scrollbar = ctk.CTkScrollbar(self.deck_list_frame, command=self.deck_listbox.yview)
+        self.deck_listbox.configure(yscrollcommand=self.deck_list_scrollbar.set)
+        self.deck_list_scrollbar.pack(side="right", fill="y")
+        self.deck_listbox.pack(side="left", fill="x", expand=True)
         # self._update_listbox_colors() # <--- REMOVED FROM HERE
 
         self.deck_button_frame = ctk.CTkFrame(self.top_frame)
@@ -593,10 +1060,9 @@ class FlashcardApp(ctk.CTk):
             self.front_html_frame = tkinterweb.HtmlFrame(self.card_frame, messages_enabled=False, vertical_scrollbar=False) # Disable scrollbars initially if desired
             # Set initial content (placeholder message)
             self._display_html_content(self.front_html_frame, "Select deck(s) and click 'Load' to begin", font_size=20)
-            self.front_html_frame.pack(pady=(15, 5), padx=10, fill="both", expand=True)
+            self.front_html_frame.pack(pady=(15, 5), padx=10, fill="both", expand=True); self._front_frame_packed = True
 
-            # Create HtmlFrame for back display, but don't pack it yet
-            self.back_html_frame = tkinterweb.HtmlFrame(self.card_frame, messages_enabled=False, vertical_scrollbar=False)
+            # Back HtmlFrame is created lazily on the first 'Show Answer' (see show_answer)
 
             # Keep a simple label for fallback/errors if tkinterweb is missing
             self.fallback_label = ctk.CTkLabel(self.card_frame, text="", font=ctk.CTkFont(size=20), wraplength=600)
@@ -604,7 +1070,7 @@ class FlashcardApp(ctk.CTk):
              # Fallback to original CTkLabel if tkinterweb is not available
              self.front_label = ctk.CTkLabel(self.card_frame, text="tkinterweb not found. Math rendering disabled.\nInstall with: pip install tkinterweb",
                                              font=ctk.CTkFont(size=16), wraplength=600, compound="center", anchor="center", text_color="orange")
-             self.front_label.pack(pady=(15, 10), padx=10, fill="both", expand=True)
+             self.front_label.pack(pady=(15, 10), padx=10, fill="both", expand=True); self._front_frame_packed = True
              self.back_label = ctk.CTkLabel(self.card_frame, text="", font=ctk.CTkFont(size=16), wraplength=600) # Keep back label structure
 
 
@@ -612,64 +1078,88 @@ class FlashcardApp(ctk.CTk):
         self.control_frame = ctk.CTkFrame(self.main_frame)
         self.control_frame.pack(pady=5, padx=10, fill="x")
         self.show_answer_button = ctk.CTkButton(self.control_frame, text="Show Answer (Space/Enter)", command=self.show_answer, state="disabled")
-        self.show_answer_button.pack(side="top", pady=5)
+        self.show_answer_button.pack(side="top", pady=5); self._show_answer_packed = True
         self.rating_frame = ctk.CTkFrame(self.control_frame, fg_color="transparent")
-        self.again_button = ctk.CTkButton(self.rating_frame, text="Again (1)", command=lambda: self.rate_card(1), width=80, fg_color="#E53E3E", hover_color="#C53030")
-        self.hard_button = ctk.CTkButton(self.rating_frame, text="Hard (2)", command=lambda: self.rate_card(2), width=80, fg_color="#DD6B20", hover_color="#C05621")
-        self.good_button = ctk.CTkButton(self.rating_frame, text="Good (3/Space/Enter)", command=lambda: self.rate_card(3), width=140)
-        self.easy_button = ctk.CTkButton(self.rating_frame, text="Easy (4)", command=lambda: self.rate_card(4), width=80, fg_color="#38A169", hover_color="#2F855A")
+        self.again_button = ctk.CTkButton(self.rating_frame, text="Again (1)", command=partial(self.rate_card, 1), width=80, fg_color="#E53E3E", hover_color="#C53030")
+        self.hard_button = ctk.CTkButton(self.rating_frame, text="Hard (2)", command=partial(self.rate_card, 2), width=80, fg_color="#DD6B20", hover_color="#C05621")
+        self.good_button = ctk.CTkButton(self.rating_frame, text="Good (3/Space/Enter)", command=partial(self.rate_card, 3), width=140)
+        self.easy_button = ctk.CTkButton(self.rating_frame, text="Easy (4)", command=partial(self.rate_card, 4), width=80, fg_color="#38A169", hover_color="#2F855A")
         self.again_button.pack(side="left", padx=5, pady=5, expand=True); self.hard_button.pack(side="left", padx=5, pady=5, expand=True)
         self.good_button.pack(side="left", padx=5, pady=5, expand=True); self.easy_button.pack(side="left", padx=5, pady=5, expand=True)
 
         # --- Status Bar Frame (Unchanged) ---
         self.status_frame = ctk.CTkFrame(self.main_frame, height=30)
         self.status_frame.pack(pady=(5,5), padx=10, fill="x")
-        self.status_label = ctk.CTkLabel(self.status_frame, text="Welcome!")
+        self.status_var = tk.StringVar(value="Welcome!"); self.cards_due_var = tk.StringVar(value="")
+        self.status_label = ctk.CTkLabel(self.status_frame, textvariable=self.status_var)
         self.status_label.pack(side="left", padx=10)
-        self.cards_due_label = ctk.CTkLabel(self.status_frame, text="")
+        self.cards_due_label = ctk.CTkLabel(self.status_frame, textvariable=self.cards_due_var)
         self.cards_due_label.pack(side="right", padx=10)
 
     # --- Theme Handling ---
     def _handle_appearance_change(self, *args):
         """Update colors when system theme changes."""
         print("Appearance mode changed:", ctk.get_appearance_mode())
-        self._update_theme_colors()
+        if not self._update_theme_colors(): return # Spurious event, same colors: nothing to re-render
+        clear_katex_template_cache()
         self._update_listbox_colors()
 
         # Re-render currently displayed cards with new theme colors
-        if TKINTERWEB_AVAILABLE and self._is_review_active and 0 <= self.current_card_index < len(self.due_cards):
-             card = self.due_cards[self.current_card_index]
-             self._display_html_content(self.front_html_frame, card['front'])
-             if self.showing_answer and self.back_html_frame:
-                 self._display_html_content(self.back_html_frame, card['back'])
+        if TKINTERWEB_AVAILABLE and self._is_review_active and self.due_cards:
+             card = self.due_cards[0]
+             self._display_card_face(self.front_html_frame, card, 'front')
+             if self.showing_answer and self.back_html_frame is not None:
+                 self._display_card_face(self.back_html_frame, card, 'back')
         elif not TKINTERWEB_AVAILABLE:
              # Update fallback labels if needed (e.g., color)
              pass # Theme manager handles CtkLabel colors automatically
 
         # Update other windows/plots as before
-        if self.manage_cards_window and self.manage_cards_window.winfo_exists():
-             self.manage_cards_window._apply_treeview_style()
+        self._configure_treeview_style()
         if self.stats_window and self.stats_window.winfo_exists() and MATPLOTLIB_AVAILABLE:
              try:
-                 current_stats = calculate_deck_statistics(self.deck_data, forecast_days=STATS_FORECAST_DAYS)
-                 if hasattr(self, 'stats_plot_frame') and self.stats_plot_frame:
+                 current_stats = self._get_deck_statistics()
+                 if self.stats_plot_frame is not None and not self._refresh_stats_chart(current_stats):
                      self._create_stats_chart(self.stats_plot_frame, current_stats)
              except Exception as e: print(f"Error updating stats plot theme: {e}")
 
-    def _update_theme_colors(self):
-        """Reads current theme colors from the already loaded theme data."""
-        self._current_text_color = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkLabel"]["text_color"])
-        self._current_bg_color = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkFrame"]["fg_color"])
-        self._current_listbox_select_bg = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["fg_color"])
-        self._current_listbox_select_fg = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["text_color"])
+    def _update_theme_colors(self) -> bool:
+        """Reads current theme colors from the already loaded theme data. Returns True if any of them changed."""
+        tm = ctk.ThemeManager.theme; apply = self._apply_appearance_mode
+        is_dark = ctk.get_appearance_mode().lower() == "dark" # Query the mode once for all four colors
+        button_theme = tm["CTkButton"]
+        self._current_text_color = apply(tm["CTkLabel"]["text_color"], is_dark)
+        self._current_bg_color = apply(tm["CTkFrame"]["fg_color"], is_dark)
+        self._current_listbox_select_bg = apply(button_theme["fg_color"], is_dark)
+        self._current_listbox_select_fg = apply(button_theme["text_color"], is_dark)
+        self._current_button_hover_color = apply(button_theme["hover_color"], is_dark)
+        new_theme = (self._current_text_color, self._current_bg_color, self._current_listbox_select_bg, self._current_listbox_select_fg, self._current_button_hover_color)
+        changed = new_theme != self._prev_theme_tuple
+        self._prev_theme_tuple = new_theme
+        if changed: self._html_cache.clear() # Cached HTML embeds the colors
+        return changed
+
+    def _configure_treeview_style(self):
+        """Applies the stored theme colors to the (process-global) ttk Treeview styles used by the card manager."""
+        style = ttk.Style(self)
+        bg_col = self._current_bg_color; fg_col = self._current_text_color
+        select_bg_col = self._current_listbox_select_bg; select_fg_col = self._current_listbox_select_fg
+
+        style.theme_use("default")
+        style.configure("Treeview", background=bg_col, foreground=fg_col, fieldbackground=bg_col, rowheight=25)
+        style.map("Treeview", background=[('selected', select_bg_col)], foreground=[('selected', select_fg_col)])
+        try: # Font setting might fail on some systems/themes
+             style.configure("Treeview.Heading", background=select_bg_col, foreground=select_fg_col,
+                             relief="flat", font=ctk.ThemeManager.theme["CTkFont"]["family"])
+        except tk.TclError:
+             style.configure("Treeview.Heading", background=select_bg_col, foreground=select_fg_col,
+                             relief="flat") # Fallback without font
+        style.map("Treeview.Heading", background=[('active', self._current_button_hover_color)])
 
     def _update_listbox_colors(self):
         """Sets the colors for the Tkinter Listbox based on CURRENTLY STORED theme colors."""
-        # Ensure theme colors are loaded before trying to access them
-        if not hasattr(self, '_current_text_color'):
-            self._update_theme_colors()
         # Added checks to ensure listbox exists before configuring
-        if hasattr(self, 'deck_listbox') and self.deck_listbox:
+        if self.deck_listbox is not None:
             try:
                 self.deck_listbox.configure(bg=self._current_bg_color, fg=self._current_text_color,
                                             selectbackground=self._current_listbox_select_bg,
@@ -680,80 +1170,123 @@ class FlashcardApp(ctk.CTk):
              print("Warning: Attempted to update listbox colors, but listbox widget not found.")
 
 
-    def _apply_appearance_mode(self, color: Any) -> str:
+    def _apply_appearance_mode(self, color: Any, is_dark: Optional[bool] = None) -> str:
         """Gets the light/dark mode color string, converting known gray names to hex."""
-        color_str = ""
+        if is_dark is None: is_dark = ctk.get_appearance_mode().lower() == "dark"
         if isinstance(color, (list, tuple)) and len(color) >= 2:
-            mode_index = 1 if ctk.get_appearance_mode().lower() == "dark" else 0
-            color_str = color[mode_index] if color[mode_index] is not None else "#000000"
+            color_str = color[1 if is_dark else 0]
+            if color_str is None: return "#000000"
         elif isinstance(color, str): color_str = color
-        else: color_str = "#FFFFFF" if ctk.get_appearance_mode().lower() == "light" else "#000000"
+        else: return "#000000" if is_dark else "#FFFFFF"
+        if color_str.startswith("#"): return color_str # Already hex
         return GRAY_NAME_TO_HEX.get(color_str, color_str)
 
     # --- UI Update Methods ---
-    def update_status(self, message: str):
-        if hasattr(self, 'status_label') and self.status_label:
-             self.status_label.configure(text=message)
-
-    def update_due_count(self):
-        if hasattr(self, 'cards_due_label') and self.cards_due_label:
-            if self._is_review_active and self.due_cards and self.current_card_index < len(self.due_cards):
-                remaining = len(self.due_cards) - self.current_card_index
-                self.cards_due_label.configure(text=f"Due: {remaining}")
+    def update_status(self, message: str, duration_ms: Optional[int] = None):
+        """Shows a message in the status bar, optionally clearing it after `duration_ms`."""
+        if self.status_label is not None:
+             self.status_var.set(message)
+             if self._status_clear_after_id is not None:
+                 self.after_cancel(self._status_clear_after_id)
+                 self._status_clear_after_id = None
+             if duration_ms:
+                 self._status_clear_after_id = self.after(duration_ms, self._clear_status)
+
+    def _clear_status(self):
+        self._status_clear_after_id = None
+        self.update_status("")
+
+    def _request_due_count_update(self):
+        """Schedules a due-count refresh; calls within the same 50 ms collapse into one due query."""
+        if self._due_count_after_id is None:
+            self._due_count_after_id = self.after(50, self._flush_due_count)
+
+    def _flush_due_count(self):
+        """Updates the due-count label (the deferred half of _request_due_count_update)."""
+        self._due_count_after_id = None
+        if self.cards_due_label is not None:
+            if self._is_review_active and self.due_cards:
+                remaining = len(self.due_cards)
+                self.cards_due_var.set(f"Due: {remaining}")
             elif self.current_deck_paths:
-                current_due_count = len(get_due_cards(self.deck_data))
-                self.cards_due_label.configure(text=f"Due Today: {current_due_count}")
+                current_due_count = len(self._get_due_cards())
+                self.cards_due_var.set(f"Due Today: {current_due_count}")
                 if current_due_count == 0 and not self._is_review_active and self.deck_data:
                     self.update_status("No cards due today in selected deck(s).")
             else:
-                self.cards_due_label.configure(text="")
+                self.cards_due_var.set("")
 
 
     def populate_deck_listbox(self):
+        """Scans the decks folder on the worker pool and refills the listbox once the scan is done."""
         # Ensure listbox exists before manipulating
-        if not hasattr(self, 'deck_listbox') or not self.deck_listbox:
+        if self.deck_listbox is None:
              print("Error: Deck listbox not initialized in populate_deck_listbox.")
              return
-
-        selected_indices = self.deck_listbox.curselection()
-        self.available_decks = find_decks(self.decks_dir)
+        if self._deck_listing_future is not None: return # A scan is already running; it will refresh the list
+
+        selected_indices = self.deck_listbox.curselection() # Captured now, before the list can change
+        self._deck_listing_future = self._deck_executor.submit(_find_decks_collecting_errors, self.decks_dir)
+        self.after(20, self._check_deck_listing_future, selected_indices)
+
+    def _check_deck_listing_future(self, selected_indices: Tuple[int, ...]):
+        """Polls the background deck scan and fills the listbox once it is done."""
+        future = self._deck_listing_future
+        if future is None: return # Cancelled (e.g. app closing)
+        if not future.done():
+            self.after(20, self._check_deck_listing_future, selected_indices); return
+        self._deck_listing_future = None
+        try: csv_files, errors = future.result()
+        except Exception as e: csv_files, errors = [], [("Error", f"An unexpected error occurred while listing decks: {e}")]
+        for title, message in errors: messagebox.showerror(title, message)
+        self._populate_deck_listbox_ui(csv_files, selected_indices)
+
+    def _populate_deck_listbox_ui(self, csv_files: List[str], selected_indices: Tuple[int, ...]):
+        """Refills the listbox from a finished deck scan, restoring the previous selection."""
+        if self.deck_listbox is None: return
+        splitext = os.path.splitext; join = os.path.join; decks_dir = self.decks_dir
+        self.available_decks = [{'file': f, 'name': splitext(f)[0], 'path': sys.intern(join(decks_dir, f))} for f in csv_files]
+        self._deckname_cache.update((deck['path'], deck['name']) for deck in self.available_decks)
         self.deck_listbox.delete(0, tk.END)
         if not self.available_decks:
             self.deck_listbox.insert(tk.END, " No decks found in 'decks' folder "); self.deck_listbox.configure(state="disabled")
-            if hasattr(self, 'load_button') and self.load_button: self.load_button.configure(state="disabled")
+            if self.load_button is not None: self.load_button.configure(state="disabled")
             self.update_status(f"No decks found in '{self.decks_dir}'. Add CSV files there.")
             self.reset_session_state()
             placeholder_msg = "Add decks (.csv) to the 'decks' folder"
             if TKINTERWEB_AVAILABLE:
                 # Check if frame exists before using
-                if hasattr(self, 'front_html_frame') and self.front_html_frame:
+                if self.front_html_frame is not None:
                      self._display_html_content(self.front_html_frame, placeholder_msg, font_size=20)
-            elif hasattr(self, 'front_label'): # Fallback
+            elif self.front_label is not None: # Fallback
                 self.front_label.configure(text=placeholder_msg)
 
         else:
             self.deck_listbox.configure(state="normal")
-            if hasattr(self, 'load_button') and self.load_button: self.load_button.configure(state="normal")
+            if self.load_button is not None: self.load_button.configure(state="normal")
 
-            for deck_file in self.available_decks: self.deck_listbox.insert(tk.END, f" {os.path.splitext(deck_file)[0]}")
+            self.deck_listbox.insert(tk.END, *[f" {deck['name']}" for deck in self.available_decks]) # One Tcl call
 
-            # Restore selection safely
-            current_size = self.deck_listbox.size()
-            for index in selected_indices:
-                if 0 <= index < current_size:
-                    self.deck_listbox.selection_set(index)
+            # Restore selection safely, one selection_set call per run of consecutive indices
+            current_size = len(self.available_decks)
+            valid_indices = sorted(index for index in selected_indices if 0 <= index < current_size)
+            run_start = None
+            for pos, index in enumerate(valid_indices):
+                if run_start is None: run_start = index
+                if pos + 1 == len(valid_indices) or valid_indices[pos + 1] != index + 1:
+                    self.deck_listbox.selection_set(run_start, index); run_start = None
 
             if not self.current_deck_paths:
                 self.update_status(f"Found {len(self.available_decks)} deck(s). Select and click Load.")
                 self.reset_session_state()
                 placeholder_msg = "Select deck(s) and click 'Load' to begin"
                 if TKINTERWEB_AVAILABLE:
-                     if hasattr(self, 'front_html_frame') and self.front_html_frame:
+                     if self.front_html_frame is not None:
                           self._display_html_content(self.front_html_frame, placeholder_msg, font_size=20)
-                elif hasattr(self, 'front_label'): # Fallback
+                elif self.front_label is not None: # Fallback
                      self.front_label.configure(text=placeholder_msg)
             else:
-                loaded_deck_names = [os.path.splitext(os.path.basename(p))[0] for p in self.current_deck_paths]
+                loaded_deck_names = [self._deck_name_for(p) for p in self.current_deck_paths]
                 self.update_status(f"Loaded: {', '.join(loaded_deck_names)}")
 
 
@@ -761,7 +1294,7 @@ class FlashcardApp(ctk.CTk):
          """Sets HTML content in the specified HtmlFrame."""
          if not TKINTERWEB_AVAILABLE or not html_frame:
              print("Error: Attempted to display HTML content, but tkinterweb is not available or frame is invalid.")
-             if hasattr(self, 'fallback_label') and self.fallback_label:
+             if self.fallback_label is not None:
                  try:
                      self.fallback_label.configure(text=content)
                      if not self.fallback_label.winfo_ismapped(): # Check if packed
@@ -773,19 +1306,74 @@ class FlashcardApp(ctk.CTk):
          if not isinstance(content, str): content = str(content)
 
          try:
-             html_string = _generate_html_for_card(content, self._current_text_color, self._current_bg_color, font_size)
-             # Use after_idle to prevent potential blocking issues when loading complex content
-             self.after_idle(lambda f=html_frame, h=html_string: self._safe_load_html(f, h))
+             html_string = self._get_html(content, font_size)
+             self._queue_html_load(html_frame, html_string)
          except Exception as e:
               print(f"Error generating HTML for tkinterweb frame: {e}")
-              error_html = _generate_html_for_card(f"Error displaying content:<br>{html.escape(str(e))}", "red", self._current_bg_color)
-              self.after_idle(lambda f=html_frame, h=error_html: self._safe_load_html(f, h))
+              error_html = _generate_html_for_card(f"Error displaying content:\n{e}", "red", self._current_bg_color)
+              self._queue_html_load(html_frame, error_html)
+
+    def _get_html(self, content: str, font_size: int) -> str:
+        """Returns the themed HTML for `content`, from the LRU cache when the same text was rendered recently."""
+        key = (content, self._current_text_color, self._current_bg_color, font_size)
+        html_string = self._html_cache.get(key)
+        if html_string is None:
+            html_string = _generate_html_for_card(content, self._current_text_color, self._current_bg_color, font_size)
+            self._html_cache[key] = html_string
+            if len(self._html_cache) > HTML_CACHE_SIZE: self._html_cache.popitem(last=False)
+        else:
+            self._html_cache.move_to_end(key)
+        return html_string
+
+    def _get_card_face_html(self, card: Dict[str, Any], face: str) -> str:
+        """Returns the HTML for the card's 'front' or 'back' (cached; edited text simply misses the cache)."""
+        return self._get_html(card[face], 20 if face == 'front' else 16)
+
+    def _display_card_face(self, html_frame, card: Dict[str, Any], face: str):
+        """Loads the cached HTML for one face of the current card into a tkinterweb frame."""
+        try:
+            html_string = self._get_card_face_html(card, face)
+        except Exception as e:
+            print(f"Error generating HTML for tkinterweb frame: {e}")
+            html_string = _generate_html_for_card(f"Error displaying content:\n{e}", "red", self._current_bg_color)
+        self._queue_html_load(html_frame, html_string)
+
+    def _schedule_prewarm(self):
+        """Schedules _prewarm_next_card for the next idle tick (at most one pending)."""
+        if self._prewarm_after_id is None:
+            self._prewarm_after_id = self.after_idle(self._prewarm_next_card)
+
+    def _prewarm_next_card(self):
+        """Builds the current card's back and the next card's front into _html_cache while the user is thinking."""
+        self._prewarm_after_id = None
+        if not TKINTERWEB_AVAILABLE or not self._is_review_active: return
+        try:
+            if self.due_cards: self._get_card_face_html(self.due_cards[0], 'back')
+            if len(self.due_cards) > 1: self._get_card_face_html(self.due_cards[1], 'front')
+        except Exception as e:
+            print(f"Warning: Could not prebuild card HTML: {e}") # Display will retry and report
+
+    def _queue_html_load(self, html_frame, html_string: str):
+        """Schedules an HTML load for the next idle tick; repeated requests for a frame before then keep only the latest."""
+        if self._last_html_per_frame.get(html_frame) == html_string:
+            self._pending_html.pop(html_frame, None); return # Frame already shows exactly this
+        self._pending_html[html_frame] = html_string
+        if self._html_flush_after_id is None:
+            # Use after_idle to prevent potential blocking issues when loading complex content
+            self._html_flush_after_id = self.after_idle(self._flush_pending_html)
+
+    def _flush_pending_html(self):
+        """Loads the latest queued HTML into each frame (one parse per frame per idle tick)."""
+        pending = self._pending_html
+        self._pending_html = {}; self._html_flush_after_id = None
+        for frame, html_content in pending.items(): self._safe_load_html(frame, html_content)
 
     def _safe_load_html(self, frame, html_content):
         """Safely loads HTML into a tkinterweb frame, checking if it exists."""
         try:
             if frame.winfo_exists():
                 frame.load_html(html_content)
+                self._last_html_per_frame[frame] = html_content
         except tk.TclError as e:
             print(f"Error loading HTML (frame might be destroyed): {e}")
         except Exception as e:
@@ -794,19 +1382,19 @@ class FlashcardApp(ctk.CTk):
 
     def display_card(self):
         """Updates the UI to show the current card's front."""
-        if not hasattr(self, 'show_answer_button'): return # Bail if UI not ready
+        if self.show_answer_button is None: return # Bail if UI not ready
 
-        if self.current_card_index < 0 or self.current_card_index >= len(self.due_cards):
+        if not self.due_cards:
             # --- Session Finished / No Cards Due ---
             self._is_review_active = False
             message = ""
             deck_context = ""
             if self.current_deck_paths:
-                deck_context = f"'{', '.join(os.path.splitext(os.path.basename(p))[0] for p in self.current_deck_paths)}'"
+                deck_context = f"'{', '.join(self._deck_name_for(p) for p in self.current_deck_paths)}'"
             else:
                 deck_context = "this session"
 
-            total_due_today = len(get_due_cards(self.deck_data)) if self.deck_data else 0
+            total_due_today = len(self._get_due_cards()) if self.deck_data else 0
             if self.deck_data:
                 message = f"No more cards due today in {deck_context}!" if total_due_today == 0 else f"Session complete for {deck_context}!\n({total_due_today} cards due today in total)"
             else:
@@ -814,26 +1402,20 @@ class FlashcardApp(ctk.CTk):
 
             self.update_status("Review finished." if self.deck_data else "No deck loaded.")
 
-            if TKINTERWEB_AVAILABLE and hasattr(self, 'front_html_frame') and self.front_html_frame:
+            if TKINTERWEB_AVAILABLE and self.front_html_frame is not None:
                 self._display_html_content(self.front_html_frame, message, font_size=20)
-                if hasattr(self, 'back_html_frame') and self.back_html_frame and self.back_html_frame.winfo_ismapped():
-                    self.back_html_frame.pack_forget()
-            elif hasattr(self, 'front_label'): # Fallback
+            elif self.front_label is not None: # Fallback
                 self.front_label.configure(text=message)
-                if hasattr(self, 'back_label') and self.back_label and self.back_label.winfo_ismapped():
-                    self.back_label.pack_forget()
-
-            if hasattr(self, 'rating_frame') and self.rating_frame.winfo_ismapped():
-                 self.rating_frame.pack_forget()
+            self._hide_back_face(); self._hide_rating_frame()
 
             if self.show_answer_button:
-                if not self.show_answer_button.winfo_ismapped():
-                    self.show_answer_button.pack(side="top", pady=5)
+                if not self._show_answer_packed:
+                    self.show_answer_button.pack(side="top", pady=5); self._show_answer_packed = True
                 self.show_answer_button.configure(state="disabled", text="Show Answer (Space/Enter)")
 
-            self.update_due_count()
+            self._request_due_count_update()
             self.focus_set()
-            if hasattr(self, 'deck_listbox') and self.deck_listbox:
+            if self.deck_listbox is not None:
                  try: self.deck_listbox.focus_set()
                  except tk.TclError: pass # Ignore focus errors during shutdown etc.
             return
@@ -841,60 +1423,69 @@ class FlashcardApp(ctk.CTk):
         # --- Display Next Card ---
         self._is_review_active = True
         self.showing_answer = False
-        card = self.due_cards[self.current_card_index]
-
-        if TKINTERWEB_AVAILABLE and hasattr(self, 'front_html_frame') and self.front_html_frame:
-            if not self.front_html_frame.winfo_ismapped():
-                self.front_html_frame.pack(pady=(15, 5), padx=10, fill="both", expand=True)
-            self._display_html_content(self.front_html_frame, card['front'], font_size=20)
-            if hasattr(self, 'back_html_frame') and self.back_html_frame and self.back_html_frame.winfo_ismapped():
-                 self.back_html_frame.pack_forget()
-        elif hasattr(self, 'front_label'): # Fallback
-             if not self.front_label.winfo_ismapped():
-                 self.front_label.pack(pady=(15, 10), padx=10, fill="both", expand=True)
+        card = self.due_cards[0]
+
+        if TKINTERWEB_AVAILABLE and self.front_html_frame is not None:
+            if not self._front_frame_packed:
+                self.front_html_frame.pack(pady=(15, 5), padx=10, fill="both", expand=True); self._front_frame_packed = True
+            self._display_card_face(self.front_html_frame, card, 'front')
+            self._schedule_prewarm()
+        elif self.front_label is not None: # Fallback
+             if not self._front_frame_packed:
+                 self.front_label.pack(pady=(15, 10), padx=10, fill="both", expand=True); self._front_frame_packed = True
              self.front_label.configure(text=card['front']) # Display raw text
-             if hasattr(self, 'back_label') and self.back_label and self.back_label.winfo_ismapped():
-                 self.back_label.pack_forget()
-
-        if hasattr(self, 'rating_frame') and self.rating_frame.winfo_ismapped():
-             self.rating_frame.pack_forget()
+        self._hide_back_face(); self._hide_rating_frame()
 
         if self.show_answer_button:
-            if not self.show_answer_button.winfo_ismapped():
-                 self.show_answer_button.pack(side="top", pady=5)
+            if not self._show_answer_packed:
+                 self.show_answer_button.pack(side="top", pady=5); self._show_answer_packed = True
             self.show_answer_button.configure(state="normal", text="Show Answer (Space/Enter)")
             try: self.show_answer_button.focus_set()
             except tk.TclError: pass # Ignore focus errors
 
-        self.update_status(f"Reviewing card {self.current_card_index + 1} of {len(self.due_cards)}")
-        self.update_due_count()
+        self.update_status(f"Reviewing card {self._reviewed_count + 1} of {self._reviewed_count + len(self.due_cards)}")
+        self._request_due_count_update()
+
+
+    def _hide_back_face(self):
+        """Unpacks the answer widget (HtmlFrame or fallback label) if it is shown."""
+        if not self._back_frame_packed: return
+        back_widget = self.back_html_frame if TKINTERWEB_AVAILABLE else self.back_label
+        if back_widget is not None: back_widget.pack_forget()
+        self._back_frame_packed = False
 
+    def _hide_rating_frame(self):
+        """Unpacks the rating buttons if they are shown."""
+        if self._rating_frame_packed and self.rating_frame is not None:
+            self.rating_frame.pack_forget(); self._rating_frame_packed = False
 
     def show_answer(self):
         """Reveals the answer and shows rating buttons."""
         if not self._is_review_active or self.showing_answer: return
-        if self.current_card_index < 0 or self.current_card_index >= len(self.due_cards):
-            self.display_card() # Handle edge case where index is invalid
+        if not self.due_cards:
+            self.display_card() # Handle edge case where the queue is empty
             return
 
         self.showing_answer = True
-        card = self.due_cards[self.current_card_index]
-
-        if TKINTERWEB_AVAILABLE and hasattr(self, 'back_html_frame') and self.back_html_frame:
-             if not self.back_html_frame.winfo_ismapped():
-                  self.back_html_frame.pack(pady=(5, 15), padx=10, fill="both", expand=True)
-             self._display_html_content(self.back_html_frame, card['back'], font_size=16)
-        elif hasattr(self, 'back_label'): # Fallback
-             if not self.back_label.winfo_ismapped():
-                  self.back_label.pack(pady=(5, 15), padx=10, fill="x")
+        card = self.due_cards[0]
+
+        if TKINTERWEB_AVAILABLE:
+             if self.back_html_frame is None:
+                  self.back_html_frame = tkinterweb.HtmlFrame(self.card_frame, messages_enabled=False, vertical_scrollbar=False)
+             if not self._back_frame_packed:
+                  self.back_html_frame.pack(pady=(5, 15), padx=10, fill="both", expand=True); self._back_frame_packed = True
+             self._display_card_face(self.back_html_frame, card, 'back')
+        elif self.back_label is not None: # Fallback
+             if not self._back_frame_packed:
+                  self.back_label.pack(pady=(5, 15), padx=10, fill="x"); self._back_frame_packed = True
              self.back_label.configure(text=card['back']) # Display raw text
 
-        if hasattr(self, 'show_answer_button') and self.show_answer_button.winfo_ismapped():
-            self.show_answer_button.pack_forget()
-        if hasattr(self, 'rating_frame'):
-            if not self.rating_frame.winfo_ismapped():
-                self.rating_frame.pack(side="top", pady=5, fill="x", padx=20)
-            if hasattr(self, 'good_button'):
+        if self.show_answer_button is not None and self._show_answer_packed:
+            self.show_answer_button.pack_forget(); self._show_answer_packed = False
+        if self.rating_frame is not None:
+            if not self._rating_frame_packed:
+                self.rating_frame.pack(side="top", pady=5, fill="x", padx=20); self._rating_frame_packed = True
+            if self.good_button is not None:
                 try: self.good_button.focus_set()
                 except tk.TclError: pass # Ignore focus errors
 
@@ -905,201 +1496,355 @@ class FlashcardApp(ctk.CTk):
         """Processes the user's rating, updates schedule, and moves to the next card."""
         if not self._is_review_active or not self.showing_answer: return
 
-        # Hide back frame first
-        if TKINTERWEB_AVAILABLE and hasattr(self, 'back_html_frame') and self.back_html_frame and self.back_html_frame.winfo_ismapped():
-            self.back_html_frame.pack_forget()
-        elif hasattr(self, 'back_label') and self.back_label and self.back_label.winfo_ismapped(): # Fallback
-            self.back_label.pack_forget()
+        self._hide_back_face() # Hide back frame first
 
-        if 0 <= self.current_card_index < len(self.due_cards):
-            card = self.due_cards[self.current_card_index]
+        if self.due_cards:
+            card = self.due_cards[0]
             update_card_schedule(card, quality) # Update card data
+            self._deck_data_version += 1
+            update_hot_columns(self._hot_columns, card) # Keep the cached arrays in step
+            push_due_heap(self._due_heap, card)
+            if card.get('_dirty') and card.get('deck_filepath'): self._dirty_files.add(card['deck_filepath'])
 
             if quality == 1: # Again
-                card_to_repeat = self.due_cards.pop(self.current_card_index)
-                self.due_cards.append(card_to_repeat) # Add to end
+                self.due_cards.rotate(-1) # Move the current card to the end (O(1) popleft + append)
                 self.update_status(f"Card marked 'Again'. Will see again at the end.")
-                # Index remains the same because the list shifted
             else: # Hard, Good, Easy
-                self.current_card_index += 1 # Move to next index
+                self.due_cards.popleft(); self._reviewed_count += 1 # Move to next card
 
             self.display_card() # Display the next card (or finish message)
         else:
-            print("Error: Tried to rate card with invalid index.")
+            print("Error: Tried to rate card with an empty review queue.")
             self.display_card() # Reset display
 
 
+    def bulk_rate_cards(self, cards: List[Dict[str, Any]], quality: int):
+        """Applies one rating to many cards of deck_data via bulk_update_schedule, with rate_card's bookkeeping."""
+        if not cards: return
+        bulk_update_schedule(cards, quality)
+        self._deck_data_version += 1
+        for card in cards:
+            update_hot_columns(self._hot_columns, card) # Keep the cached arrays in step
+            push_due_heap(self._due_heap, card)
+            if card.get('_dirty') and card.get('deck_filepath'): self._dirty_files.add(card['deck_filepath'])
+        self._request_due_count_update()
+        self._schedule_flush()
+
+    def _deck_name_for(self, path: str) -> str:
+        """Returns the display name (file name without extension) of a deck path, memoized per path."""
+        name = self._deckname_cache.get(path)
+        if name is None: name = self._deckname_cache[path] = os.path.splitext(os.path.basename(path))[0]
+        return name
+
+    def _index_card(self, card: Dict[str, Any]):
+        """Adds a card of deck_data to the id lookup."""
+        card_id = card.get('id')
+        if card_id is not None: self._card_by_id[card_id] = card
+        self._deck_data_version += 1
+
+    def _deindex_card(self, card: Dict[str, Any]):
+        """Removes a card leaving deck_data from the id lookup."""
+        if self._card_by_id.get(card.get('id')) is card: del self._card_by_id[card['id']]
+        self._deck_data_version += 1
+
+    def _get_hot_columns(self) -> Optional[Dict[str, Any]]:
+        """Returns the cached struct-of-arrays view of deck_data, rebuilding it if cards were added or removed."""
+        hot = self._hot_columns
+        if hot is None or hot['source'] is not self.deck_data or hot['size'] != len(self.deck_data):
+            hot = self._hot_columns = build_hot_columns(self.deck_data)
+        return hot
+
+    def _get_due_cards(self) -> List[Dict[str, Any]]:
+        """Returns the cards of deck_data due today from the incremental due heap, rebuilding it if cards were added or removed."""
+        heap = self._due_heap
+        if heap is None or heap['source'] is not self.deck_data or heap['size'] != len(self.deck_data):
+            heap = self._due_heap = build_due_heap(self.deck_data)
+        return get_due_cards_fast(heap)
+
     # --- Deck Management ---
     def load_selected_decks(self):
-        if not hasattr(self, 'deck_listbox') or not self.deck_listbox: return # UI not ready
+        if self.deck_listbox is None: return # UI not ready
         selected_indices = self.deck_listbox.curselection()
         if not selected_indices: messagebox.showwarning("No Selection", "Please select one or more decks from the list."); return
-        selected_paths = [os.path.join(self.decks_dir, self.available_decks[i]) for i in selected_indices]
-        selected_names = [os.path.splitext(self.available_decks[i])[0] for i in selected_indices]
+        selected_paths = [self.available_decks[i]['path'] for i in selected_indices]
+        selected_names = [self.available_decks[i]['name'] for i in selected_indices]
+        if self._deck_load_futures is not None: self.update_status("Already loading deck(s), please wait..."); return
         self.save_all_dirty_cards() # Save previous deck changes
         self.update_status(f"Loading deck(s): {', '.join(selected_names)}...")
-        self.current_deck_paths = []; self.deck_data = []; load_errors = False; self.files_needing_full_save.clear()
+        self.current_deck_paths = []; self.deck_data = []; self._card_by_id = {}; self.files_needing_full_save.clear(); self._dirty_files.clear(); self._extra_keys_by_deck.clear()
+        self.due_cards = deque(); self._reviewed_count = 0; self._is_review_active = False # No reviewing the old session meanwhile
+        # Read and parse the files on worker threads so the window stays responsive; results are applied on the Tk thread
+        for filepath in selected_paths: print(f"Loading: {filepath}")
+        pending_saves = list(self._save_futures) # Reads must not overlap a rewrite of the same file
+        self._deck_load_futures = [self._deck_executor.submit(_load_deck_collecting_errors, filepath, pending_saves) for filepath in selected_paths]
+        if self.load_button is not None: self.load_button.configure(state="disabled")
+        self.after(50, self._check_deck_load_futures, selected_paths, selected_names)
+
+    def _check_deck_load_futures(self, selected_paths: List[str], selected_names: List[str]):
+        """Polls the background deck loads and finishes loading once all of them are done."""
+        futures = self._deck_load_futures
+        if futures is None: return # Cancelled (e.g. app closing)
+        if not all(future.done() for future in futures):
+            self.after(50, self._check_deck_load_futures, selected_paths, selected_names); return
+        self._deck_load_futures = None
+        if self.load_button is not None: self.load_button.configure(state="normal")
+        results = []
+        for future in futures:
+            try: results.append(future.result())
+            except Exception as e: results.append((None, [("Error", f"An unexpected error occurred while loading a deck: {e}")]))
+        self._finish_loading_decks(selected_paths, selected_names, results)
+
+    def _finish_loading_decks(self, selected_paths: List[str], selected_names: List[str], results: List[Tuple[Optional[List[Dict[str, Any]]], List[Tuple[str, str]]]]):
+        """Applies loaded decks (in selection order) and starts the review session."""
+        load_errors = False
 
         for i, filepath in enumerate(selected_paths):
-            deck_name = selected_names[i]; print(f"Loading: {filepath}")
-            single_deck = load_deck(filepath) # load_deck now handles html.escape
+            deck_name = selected_names[i]
+            single_deck, errors = results[i]
+            for title, message in errors: messagebox.showerror(title, message)
             if single_deck is None: load_errors = True; self.update_status(f"Error loading '{deck_name}'. Check console/log.")
             elif not single_deck and os.path.exists(filepath): messagebox.showwarning("Empty Deck", f"Deck '{deck_name}' is empty or could not be read properly."); self.current_deck_paths.append(filepath)
-            elif single_deck: self.deck_data.extend(single_deck); self.current_deck_paths.append(filepath)
+            elif single_deck:
+                self.deck_data.extend(single_deck); self.current_deck_paths.append(filepath)
+                for card in single_deck: self._index_card(card)
+                self._extra_keys_by_deck[filepath] = deck_extra_keys(single_deck[:1]) # load_deck gives every card the same keys
 
         if not self.deck_data and not load_errors:
              messagebox.showwarning("No Cards", "Selected deck(s) contain no valid flashcards.")
              self.reset_session_state()
              placeholder_msg="Selected deck(s) are empty."
-             if TKINTERWEB_AVAILABLE and hasattr(self, 'front_html_frame') and self.front_html_frame: self._display_html_content(self.front_html_frame, placeholder_msg, font_size=20)
-             elif hasattr(self, 'front_label'): self.front_label.configure(text=placeholder_msg)
+             if TKINTERWEB_AVAILABLE and self.front_html_frame is not None: self._display_html_content(self.front_html_frame, placeholder_msg, font_size=20)
+             elif self.front_label is not None: self.front_label.configure(text=placeholder_msg)
              self.update_status("Load failed or deck(s) empty.")
              return
         if load_errors and not self.deck_data:
              messagebox.showerror("Load Failed", "Failed to load any cards. Check CSV format and file permissions.")
              self.reset_session_state()
              placeholder_msg="Failed to load deck(s)."
-             if TKINTERWEB_AVAILABLE and hasattr(self, 'front_html_frame') and self.front_html_frame: self._display_html_content(self.front_html_frame, placeholder_msg, font_size=20)
-             elif hasattr(self, 'front_label'): self.front_label.configure(text=placeholder_msg)
+             if TKINTERWEB_AVAILABLE and self.front_html_frame is not None: self._display_html_content(self.front_html_frame, placeholder_msg, font_size=20)
+             elif self.front_label is not None: self.front_label.configure(text=placeholder_msg)
              self.update_status("Load failed.")
              return
 
-        self.due_cards = get_due_cards(self.deck_data); random.shuffle(self.due_cards); self.current_card_index = 0; self._is_review_active = True
+        due_list = self._get_due_cards()
+        if NUMPY_AVAILABLE and len(due_list) > NUMPY_SHUFFLE_THRESHOLD:
+            due_list = [due_list[i] for i in np.random.permutation(len(due_list)).tolist()] # One C-level shuffle
+        else: random.shuffle(due_list)
+        self.due_cards = deque(due_list); self._reviewed_count = 0; self._is_review_active = True
 
         # Enable buttons safely
-        if hasattr(self, 'add_card_button'): self.add_card_button.configure(state="normal")
-        if hasattr(self, 'manage_cards_button'): self.manage_cards_button.configure(state="normal")
-        if hasattr(self, 'stats_button'): self.stats_button.configure(state="normal")
+        if self.add_card_button is not None: self.add_card_button.configure(state="normal")
+        if self.manage_cards_button is not None: self.manage_cards_button.configure(state="normal")
+        if self.stats_button is not None: self.stats_button.configure(state="normal")
 
         if not self.due_cards:
             self._is_review_active = False; self.update_status(f"Loaded {len(self.deck_data)} card(s) from {len(self.current_deck_paths)} deck(s). No cards due now.")
             no_due_msg = f"No cards due right now in '{', '.join(selected_names)}'."
-            if TKINTERWEB_AVAILABLE and hasattr(self, 'front_html_frame') and self.front_html_frame: self._display_html_content(self.front_html_frame, no_due_msg, font_size=20)
-            elif hasattr(self, 'front_label'): self.front_label.configure(text=no_due_msg)
-            if hasattr(self, 'show_answer_button'): self.show_answer_button.configure(state="disabled")
+            if TKINTERWEB_AVAILABLE and self.front_html_frame is not None: self._display_html_content(self.front_html_frame, no_due_msg, font_size=20)
+            elif self.front_label is not None: self.front_label.configure(text=no_due_msg)
+            if self.show_answer_button is not None: self.show_answer_button.configure(state="disabled")
         else:
             self.update_status(f"Loaded {len(self.deck_data)} card(s). Starting review with {len(self.due_cards)} due card(s)."); self.display_card()
-        self.update_due_count()
+        self._request_due_count_update()
+
+
+    def _schedule_flush(self):
+        """(Re)starts the debounce timer so a burst of adds/edits is written in one save cycle."""
+        if self._pending_flush_id is not None: self.after_cancel(self._pending_flush_id)
+        self._pending_flush_id = self.after(SAVE_DEBOUNCE_MS, self._do_flush)
 
+    def _do_flush(self):
+        self._pending_flush_id = None
+        self.save_all_dirty_cards()
 
     def save_all_dirty_cards(self):
-        """Saves changes for modified cards and rewrites files with deletions."""
-        files_to_process = set(self.files_needing_full_save) # Start with files needing full save
-        dirty_cards_by_file = defaultdict(list)
-        for card in self.deck_data:
-            if card.get('_dirty', False):
-                filepath = card.get('deck_filepath')
-                if filepath:
-                    dirty_cards_by_file[filepath].append(card)
-                    files_to_process.add(filepath) # Also process files with dirty cards
+        """Saves changes for modified cards, appends newly added cards and rewrites files with deletions."""
+        if self._pending_flush_id is not None: # This save covers whatever the debounce timer was waiting for
+            self.after_cancel(self._pending_flush_id); self._pending_flush_id = None
+        pending_appends = self._pending_appends
+        self._pending_appends = defaultdict(list)
+        # Files needing a full rewrite plus files with modified cards; clean decks are never touched
+        files_to_process = self.files_needing_full_save | self._dirty_files
+        self._dirty_files = set()
 
-        if not files_to_process: return # Nothing to save or rewrite
+        saved_files = 0
+        if pending_appends: self._wait_for_saves() # Appends are written here; let queued rewrites land first
+        for filepath, new_cards in pending_appends.items():
+            if filepath in files_to_process: continue # The full rewrite below already includes the new cards
+            if append_cards_to_deck(filepath, new_cards):
+                self._unsynced_files.add(filepath)
+                saved_files += 1
+            else:
+                files_to_process.add(filepath) # No usable header, or the append failed: rewrite the whole file
+
+        if not files_to_process:
+            if saved_files > 0: self.update_status(f"Saved changes to {saved_files} deck file(s).")
+            return # Nothing to save or rewrite
 
         print(f"Saving changes to {len(files_to_process)} file(s)...")
-        saved_files = 0
+        # One pass over all cards: bucket the cards of every file being saved and note which have dirty cards
+        cards_by_file: Dict[str, List[Dict[str, Any]]] = defaultdict(list); files_with_dirty_cards: Set[str] = set()
+        for card in self.deck_data:
+            filepath = card.get('deck_filepath')
+            if filepath in files_to_process:
+                cards_by_file[filepath].append(card)
+                if card.get('_dirty', False): files_with_dirty_cards.add(filepath)
         for filepath in files_to_process:
              # Get ALL current cards belonging to this file for saving/rewriting
-             full_deck_for_file = [c for c in self.deck_data if c.get('deck_filepath') == filepath]
+             full_deck_for_file = cards_by_file[filepath]
 
              # Check if save is needed (either full rewrite or dirty cards exist)
-             needs_save = (filepath in self.files_needing_full_save) or any(c.get('_dirty', False) for c in full_deck_for_file)
+             needs_save = (filepath in self.files_needing_full_save) or filepath in files_with_dirty_cards
 
              if needs_save:
                  print(f"Saving {len(full_deck_for_file)} card(s) to {os.path.basename(filepath)} (Rewrite: {filepath in self.files_needing_full_save})...")
-                 save_deck(filepath, full_deck_for_file) # save_deck now handles html.unescape
+                 # Write a snapshot on the saver thread; the live cards stay free to change meanwhile
+                 deck_snapshot = [dict(card) for card in full_deck_for_file]
+                 for card in full_deck_for_file:
+                     if '_dirty' in card: card['_dirty'] = False # Later edits mark them dirty again
+                 future = self._save_executor.submit(_save_deck_collecting_errors, filepath, deck_snapshot, self._extra_keys_by_deck.get(filepath))
+                 self._save_futures[future] = filepath
+                 self._unsynced_files.add(filepath)
                  saved_files += 1
-             # Dirty flags are reset within save_deck
 
         if saved_files > 0: self.update_status(f"Saved changes to {saved_files} deck file(s).")
         self.files_needing_full_save.clear() # Clear the rewrite set after processing
+        if self._save_futures and self._save_poll_after_id is None:
+            self._save_poll_after_id = self.after(50, self._check_save_futures)
+
+    def _check_save_futures(self):
+        """Collects finished background saves, reporting errors and queuing failed files for another rewrite."""
+        self._save_poll_after_id = None
+        for future in [f for f in self._save_futures if f.done()]:
+            filepath = self._save_futures.pop(future)
+            try: saved, errors = future.result()
+            except Exception as e: saved, errors = False, [("Save Error", f"An unexpected error occurred while saving '{os.path.basename(filepath)}': {e}")]
+            for title, message in errors: messagebox.showerror(title, message)
+            if not saved and filepath in self.current_deck_paths: self.files_needing_full_save.add(filepath) # Retry on next save
+        if self._save_futures:
+            self._save_poll_after_id = self.after(50, self._check_save_futures)
+
+    def _wait_for_saves(self):
+        """Blocks until every queued background save has been written, then collects the results."""
+        if not self._save_futures: return
+        concurrent.futures.wait(list(self._save_futures))
+        self._check_save_futures()
+
+    def flush_all_pending(self, sync: bool = True):
+        """Writes all pending changes; with sync=True also fsyncs every file written since the last sync."""
+        self.save_all_dirty_cards()
+        if not sync: return
+        self._wait_for_saves() # fsync only after the saver thread has written everything
+        for filepath in self._unsynced_files:
+            try:
+                with open(filepath, mode='ab') as f: os.fsync(f.fileno())
+            except OSError as e:
+                print(f"Warning: Could not sync '{filepath}' to disk: {e}")
+        self._unsynced_files.clear()
 
 
     def reset_session_state(self):
         """Resets the application state when no deck is loaded or list is reloaded."""
         self.save_all_dirty_cards() # Save any pending changes first
-        self.current_deck_paths = []; self.deck_data = []; self.due_cards = []
-        self.current_card_index = -1; self.showing_answer = False; self._is_review_active = False
-        self.files_needing_full_save.clear()
+        self.current_deck_paths = []; self.deck_data = []; self._card_by_id = {}; self.due_cards = deque()
+        self._reviewed_count = 0; self.showing_answer = False; self._is_review_active = False
+        self.files_needing_full_save.clear(); self._dirty_files.clear(); self._extra_keys_by_deck.clear()
 
-        # Hide back display safely
-        if TKINTERWEB_AVAILABLE and hasattr(self, 'back_html_frame') and self.back_html_frame and self.back_html_frame.winfo_ismapped():
-            self.back_html_frame.pack_forget()
-        elif hasattr(self, 'back_label') and self.back_label and self.back_label.winfo_ismapped():
-            self.back_label.pack_forget()
+        self._hide_back_face() # Hide back display safely
 
         # Disable buttons safely
-        if hasattr(self, 'add_card_button'): self.add_card_button.configure(state="disabled")
-        if hasattr(self, 'manage_cards_button'): self.manage_cards_button.configure(state="disabled")
-        if hasattr(self, 'stats_button'): self.stats_button.configure(state="disabled")
-        if hasattr(self, 'show_answer_button'): self.show_answer_button.configure(state="disabled")
-        if hasattr(self, 'rating_frame') and self.rating_frame.winfo_ismapped(): self.rating_frame.pack_forget()
+        if self.add_card_button is not None: self.add_card_button.configure(state="disabled")
+        if self.manage_cards_button is not None: self.manage_cards_button.configure(state="disabled")
+        if self.stats_button is not None: self.stats_button.configure(state="disabled")
+        if self.show_answer_button is not None: self.show_answer_button.configure(state="disabled")
+        self._hide_rating_frame()
 
-        self.update_due_count() # Clear due count
+        self._request_due_count_update() # Clear due count
 
 
     # --- Window Management (largely unchanged, ensure content is handled) ---
     def open_add_card_window(self, manage_window_ref=None):
-        """Opens a window to add a new flashcard."""
-        if self.add_card_window is not None and self.add_card_window.winfo_exists():
+        """Opens a window to add a new flashcard (built once, then withdrawn and re-shown)."""
+        if self._add_card_visible:
             self.add_card_window.focus(); return
 
         if not self.current_deck_paths:
              messagebox.showerror("Error", "Please load at least one deck before adding a card."); return
 
         target_deck_path = self.current_deck_paths[0]
-        target_deck_name = os.path.splitext(os.path.basename(target_deck_path))[0]
-        window_title = f"Add New Card to '{target_deck_name}'"
+        target_deck_name = self._deck_name_for(target_deck_path)
         if len(self.current_deck_paths) > 1:
              messagebox.showwarning("Multiple Decks", f"Multiple decks loaded. Card will be added to the *first* loaded deck: '{target_deck_name}'", parent=self if manage_window_ref is None else manage_window_ref)
+        self._add_card_target_path = target_deck_path; self._add_card_manage_ref = manage_window_ref
 
+        if self.add_card_window is None or not self.add_card_window.winfo_exists():
+            self._build_add_card_window()
+        else:
+            self.add_card_window.deiconify()
+            self._add_card_front_entry.delete("1.0", tk.END); self._add_card_back_entry.delete("1.0", tk.END)
+        self.add_card_window.title(f"Add New Card to '{target_deck_name}'")
+        self.add_card_window.grab_set()
+        self.center_toplevel(self.add_card_window)
+        self._add_card_visible = True
+        self._add_card_front_entry.focus_set()
+
+    def _build_add_card_window(self):
+        """Creates the Add Card window's widgets; open_add_card_window sets its title and target deck."""
         self.add_card_window = ctk.CTkToplevel(self)
-        self.add_card_window.title(window_title)
         self.add_card_window.geometry("450x300")
         self.add_card_window.transient(self)
-        self.add_card_window.grab_set()
-        self.center_toplevel(self.add_card_window)
+        self.add_card_window.protocol("WM_DELETE_WINDOW", self._on_add_card_close)
 
         ctk.CTkLabel(self.add_card_window, text="Front:").pack(pady=(10,0), padx=10, anchor="w")
-        front_entry = ctk.CTkTextbox(self.add_card_window, height=60, wrap="word")
-        front_entry.pack(pady=5, padx=10, fill="x")
+        self._add_card_front_entry = ctk.CTkTextbox(self.add_card_window, height=60, wrap="word")
+        self._add_card_front_entry.pack(pady=5, padx=10, fill="x")
         ctk.CTkLabel(self.add_card_window, text="Back:").pack(pady=(5,0), padx=10, anchor="w")
-        back_entry = ctk.CTkTextbox(self.add_card_window, height=80, wrap="word")
-        back_entry.pack(pady=5, padx=10, fill="x")
+        self._add_card_back_entry = ctk.CTkTextbox(self.add_card_window, height=80, wrap="word")
+        self._add_card_back_entry.pack(pady=5, padx=10, fill="x")
         button_frame = ctk.CTkFrame(self.add_card_window); button_frame.pack(pady=(10, 10), padx=10, fill="x")
 
-        def submit_card():
-            front_raw = front_entry.get("1.0", tk.END).strip();
-            back_raw = back_entry.get("1.0", tk.END).strip()
-            if not front_raw or not back_raw: messagebox.showerror("Error", "Both Front and Back fields are required.", parent=self.add_card_window); return
-
-            front_escaped = html.escape(front_raw)
-            back_escaped = html.escape(back_raw)
-
-            new_card_id = f"new_{int(datetime.datetime.now().timestamp())}_{random.randint(100,999)}"
-            new_card = {
-                'id': new_card_id, 'front': front_escaped, 'back': back_escaped,
-                'next_review_date': datetime.date.today(), 'interval_days': 0.0,
-                'ease_factor': DEFAULT_EASE_FACTOR, 'lapses': 0, 'reviews': 0,
-                'deck_filepath': target_deck_path, '_dirty': True
-            }
-            self.deck_data.append(new_card)
-            self.files_needing_full_save.add(target_deck_path)
-            self.update_status(f"Added new card to '{target_deck_name}'.")
-            self.update_due_count()
-            self.save_all_dirty_cards()
-
-            if manage_window_ref and manage_window_ref.winfo_exists():
-                 manage_window_ref._populate_card_list()
-
-            front_entry.delete("1.0", tk.END); back_entry.delete("1.0", tk.END); front_entry.focus_set()
-
-        def cancel_add(): self.add_card_window.destroy()
-
-        add_button = ctk.CTkButton(button_frame, text="Add Card", command=submit_card)
+        add_button = ctk.CTkButton(button_frame, text="Add Card", command=self._submit_new_card)
         add_button.pack(side="left", padx=(0, 10), expand=True)
-        cancel_button = ctk.CTkButton(button_frame, text="Close", command=cancel_add, fg_color="gray")
+        cancel_button = ctk.CTkButton(button_frame, text="Close", command=self._on_add_card_close, fg_color="gray")
         cancel_button.pack(side="right", padx=(10, 0), expand=True)
-        self.add_card_window.bind("<Escape>", lambda event: cancel_add()); front_entry.focus_set()
+        self.add_card_window.bind("<Escape>", lambda event: self._on_add_card_close())
+
+    def _submit_new_card(self):
+        """Adds the card typed into the Add Card window to its target deck and clears the fields for the next one."""
+        front_entry = self._add_card_front_entry; back_entry = self._add_card_back_entry
+        front_raw = _get_textbox_text(front_entry)
+        back_raw = _get_textbox_text(back_entry)
+        if not front_raw or not back_raw: messagebox.showerror("Error", "Both Front and Back fields are required.", parent=self.add_card_window); return
+
+        target_deck_path = self._add_card_target_path
+        new_card_id = f"new_{next(self._next_id_seq)}"
+        new_card = {
+            'id': new_card_id, 'front': front_raw, 'back': back_raw,
+            'next_review_date': datetime.date.today(), 'next_review_ordinal': datetime.date.today().toordinal(), 'interval_days': 0.0,
+            'ease_factor': DEFAULT_EASE_FACTOR, 'lapses': 0, 'reviews': 0,
+            'deck_filepath': target_deck_path, '_dirty': True
+        }
+        self.deck_data.append(new_card); self._index_card(new_card)
+        self._pending_appends[target_deck_path].append(new_card) # Appended to the file, no full rewrite
+        self._request_due_count_update()
+        self._schedule_flush()
+        self.update_status(f"Added new card to '{self._deck_name_for(target_deck_path)}'.", duration_ms=2000) # Non-blocking confirmation
+
+        manage_window_ref = self._add_card_manage_ref
+        if manage_window_ref and manage_window_ref.winfo_exists():
+             manage_window_ref.mark_dirty()
+
+        front_entry.delete("1.0", tk.END); back_entry.delete("1.0", tk.END); front_entry.focus_set()
+
+    def _on_add_card_close(self):
+        """Hides the Add Card window for reuse; the window itself is only destroyed in on_close."""
+        if not self._add_card_visible: return
+        self._add_card_visible = False; self._add_card_manage_ref = None
+        try:
+            self.add_card_window.grab_release()
+            self.add_card_window.withdraw()
+        except tk.TclError:
+            pass # Window already destroyed
 
 
     def open_edit_card_window(self, card_to_edit: Dict[str, Any], manage_window_ref):
@@ -1118,12 +1863,12 @@ class FlashcardApp(ctk.CTk):
         ctk.CTkLabel(self.edit_card_window, text="Front:").pack(pady=(10,0), padx=10, anchor="w")
         front_entry = ctk.CTkTextbox(self.edit_card_window, height=60, wrap="word")
         front_entry.pack(pady=5, padx=10, fill="x")
-        front_entry.insert("1.0", html.unescape(card_to_edit.get('front', '')))
+        front_entry.insert("1.0", card_to_edit.get('front', ''))
 
         ctk.CTkLabel(self.edit_card_window, text="Back:").pack(pady=(5,0), padx=10, anchor="w")
         back_entry = ctk.CTkTextbox(self.edit_card_window, height=80, wrap="word")
         back_entry.pack(pady=5, padx=10, fill="x")
-        back_entry.insert("1.0", html.unescape(card_to_edit.get('back', '')))
+        back_entry.insert("1.0", card_to_edit.get('back', ''))
 
         srs_info_frame = ctk.CTkFrame(self.edit_card_window, fg_color="transparent")
         srs_info_frame.pack(pady=5, padx=10, fill="x")
@@ -1136,24 +1881,23 @@ class FlashcardApp(ctk.CTk):
         button_frame = ctk.CTkFrame(self.edit_card_window); button_frame.pack(pady=(10, 10), padx=10, fill="x")
 
         def submit_changes():
-            new_front_raw = front_entry.get("1.0", tk.END).strip()
-            new_back_raw = back_entry.get("1.0", tk.END).strip()
+            new_front_raw = _get_textbox_text(front_entry)
+            new_back_raw = _get_textbox_text(back_entry)
             if not new_front_raw or not new_back_raw: messagebox.showerror("Error", "Front and Back cannot be empty.", parent=self.edit_card_window); return
 
-            new_front_escaped = html.escape(new_front_raw)
-            new_back_escaped = html.escape(new_back_raw)
-
-            original_card = next((c for c in self.deck_data if c.get('id') == card_to_edit.get('id')), None)
+            original_card = self._card_by_id.get(card_to_edit.get('id'))
 
             if original_card:
-                 if original_card['front'] != new_front_escaped or original_card['back'] != new_back_escaped:
-                      original_card['front'] = new_front_escaped
-                      original_card['back'] = new_back_escaped
+                 if original_card['front'] != new_front_raw or original_card['back'] != new_back_raw:
+                      original_card['front'] = new_front_raw
+                      original_card['back'] = new_back_raw
                       original_card['_dirty'] = True
+                      self._deck_data_version += 1
+                      if original_card.get('deck_filepath'): self._dirty_files.add(original_card['deck_filepath'])
                       self.update_status(f"Updated card.")
-                      self.save_all_dirty_cards()
+                      self._schedule_flush()
                       if manage_window_ref and manage_window_ref.winfo_exists():
-                           manage_window_ref._populate_card_list()
+                           manage_window_ref.mark_dirty()
                  self.edit_card_window.destroy()
             else:
                  messagebox.showerror("Error", "Could not find the original card to update.", parent=self.edit_card_window)
@@ -1167,6 +1911,16 @@ class FlashcardApp(ctk.CTk):
         self.edit_card_window.bind("<Escape>", lambda event: cancel_edit()); front_entry.focus_set()
 
 
+    @property
+    def manage_cards_window(self) -> Optional["ManageCardsWindow"]:
+        """The open card manager, if any. Held weakly, so a closed window and its card lists are freed right away."""
+        ref = self._manage_cards_window_ref
+        return ref() if ref is not None else None
+
+    @manage_cards_window.setter
+    def manage_cards_window(self, window: Optional["ManageCardsWindow"]):
+        self._manage_cards_window_ref = weakref.ref(window) if window is not None else None
+
     def open_manage_cards_window(self):
         """Opens the card browser/management window."""
         if not self.deck_data: messagebox.showinfo("Manage Cards", "No deck loaded."); return
@@ -1195,11 +1949,11 @@ class FlashcardApp(ctk.CTk):
         text_stats_frame = ctk.CTkFrame(stats_main_frame); text_stats_frame.pack(pady=5, padx=5, fill="x")
         plot_frame = ctk.CTkFrame(stats_main_frame); plot_frame.pack(pady=5, padx=5, fill="both", expand=True)
         self.stats_plot_frame = plot_frame
-        stats = calculate_deck_statistics(self.deck_data, forecast_days=STATS_FORECAST_DAYS)
+        stats = self._get_deck_statistics()
 
         stats_text_widget = ctk.CTkTextbox(text_stats_frame, wrap="none", height=280, activate_scrollbars=True)
         stats_text_widget.pack(pady=5, padx=5, fill="x"); stats_text_widget.configure(state="normal"); stats_text_widget.delete("1.0", tk.END)
-        loaded_deck_names = [os.path.splitext(os.path.basename(p))[0] for p in self.current_deck_paths]
+        loaded_deck_names = [self._deck_name_for(p) for p in self.current_deck_paths]
         stats_text_widget.insert(tk.END, f"--- Deck Overview {'-'*20}\nDeck(s):\t\t{', '.join(loaded_deck_names)}\nTotal Cards:\t\t{stats['total_cards']}\n")
         stats_text_widget.insert(tk.END, f"  - New:\t\t{stats['new_cards']}\n  - Learning (<{21}d):\t{stats['learning_cards']}\n  - Young (<{90}d):\t{stats['young_cards']}\n  - Mature (>= {90}d):\t{stats['mature_cards']}\n\n")
         stats_text_widget.insert(tk.END, f"--- Scheduling {'-'*23}\nDue Today:\t\t{stats['due_today']}\nDue Tomorrow:\t\t{stats['due_tomorrow']}\nDue in Next 7 Days:\t{stats['due_next_7_days']} (excluding today)\n\n")
@@ -1213,50 +1967,99 @@ class FlashcardApp(ctk.CTk):
         stats_text_widget.insert(tk.END, f"Cards Lapsed:\t\t{stats['lapsed_card_count']} ({stats['lapsed_card_count']/stats['total_cards']:.1%} of total)\n" if stats['total_cards'] > 0 else "Cards Lapsed:\t\t0\n")
         stats_text_widget.configure(state="disabled")
 
-        if MATPLOTLIB_AVAILABLE:
+        if _load_matplotlib():
             try: self._create_stats_chart(plot_frame, stats)
             except Exception as e: ctk.CTkLabel(plot_frame, text=f"Error creating plot: {e}", text_color="red").pack(pady=10); print(f"Matplotlib Error: {e}")
         else: ctk.CTkLabel(plot_frame, text="Matplotlib not installed. Plotting disabled.\n(Run: pip install matplotlib)", text_color="orange").pack(pady=20)
         ctk.CTkButton(stats_main_frame, text="Close", command=self._on_stats_close).pack(pady=(5, 10))
         self.stats_window.bind("<Escape>", lambda event: self._on_stats_close())
 
+    def _stats_key(self) -> Tuple[Any, ...]:
+        """Identifies the inputs of the deck statistics: which cards, their version, and today's date."""
+        return (id(self.deck_data), len(self.deck_data), self._deck_data_version, datetime.date.today())
+
+    def _get_deck_statistics(self) -> Dict[str, Any]:
+        """Returns calculate_deck_statistics for deck_data, reusing the last result while no card has changed."""
+        key = self._stats_key()
+        if self._stats_cache is None or self._stats_cache[0] != key:
+            self._stats_cache = (key, calculate_deck_statistics(self.deck_data, forecast_days=STATS_FORECAST_DAYS, hot_columns=self._get_hot_columns()))
+        return self._stats_cache[1]
+
     def _create_stats_chart(self, parent_frame: ctk.CTkFrame, stats: Dict[str, Any]):
-        """Creates and embeds the Matplotlib forecast chart."""
+        """Creates and embeds the Matplotlib forecast chart (reusing the last closed window's figure if still current)."""
         for widget in parent_frame.winfo_children(): widget.destroy()
-        self.stats_figure_canvas = None; self.stats_toolbar = None
+        self.stats_figure_canvas = None; self.stats_toolbar = None; self._stats_chart = None
+        cached_chart = self._stats_chart_cache; self._stats_chart_cache = None
+        if cached_chart is not None and cached_chart['key'] == self._stats_key():
+            self._stats_chart = chart = cached_chart; fig = chart['fig']
+            self._apply_stats_chart_theme() # The theme may have changed since it was closed
+        else:
+            forecast_data = stats.get("due_counts_forecast", {})
+            if not forecast_data: ctk.CTkLabel(parent_frame, text="No forecast data available.").pack(pady=10); return
+            dates = list(forecast_data.keys()); counts = list(forecast_data.values()); cumulative_counts = list(itertools.accumulate(counts))
+            bar_color = STATS_BAR_COLOR; line_color = STATS_LINE_COLOR
+            fig = Figure(figsize=(7, 4), dpi=100); ax1 = fig.add_subplot(111)
+            bars = ax1.bar(dates, counts, label='Cards Due Daily', color=bar_color, width=0.7); ax1.set_xlabel("Date"); ax1.set_ylabel("Cards Due", color=bar_color)
+            ax2 = ax1.twinx(); line, = ax2.plot(dates, cumulative_counts, label='Cumulative Due', color=line_color, marker='.', linestyle='-'); ax2.set_ylabel("Total Cumulative Cards", color=line_color)
+            suptitle = fig.suptitle("Review Forecast"); title = ax1.set_title(f"Next {STATS_FORECAST_DAYS} Days", fontsize=10)
+            self._stats_chart = {'fig': fig, 'ax1': ax1, 'ax2': ax2, 'bars': bars, 'line': line, 'dates': dates, 'titles': (suptitle, title), 'key': self._stats_key()}
+            self._apply_stats_chart_theme()
+            fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+        self.stats_figure_canvas = FigureCanvasTkAgg(fig, master=parent_frame); canvas_widget = self.stats_figure_canvas.get_tk_widget(); canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.stats_toolbar = NavigationToolbar2Tk(self.stats_figure_canvas, parent_frame, pack_toolbar=False)
+        self._style_stats_toolbar()
+        self.stats_toolbar.update(); self.stats_toolbar.pack(side=tk.BOTTOM, fill=tk.X); self.stats_figure_canvas.draw()
+
+    def _refresh_stats_chart(self, stats: Dict[str, Any]) -> bool:
+        """Updates the existing chart's artists and colours in place. Returns False if it must be rebuilt instead."""
+        chart = self._stats_chart
+        if chart is None or self.stats_figure_canvas is None: return False
         forecast_data = stats.get("due_counts_forecast", {})
-        if not forecast_data: ctk.CTkLabel(parent_frame, text="No forecast data available.").pack(pady=10); return
-        dates = list(forecast_data.keys()); counts = list(forecast_data.values()); cumulative_counts = [sum(counts[:i+1]) for i in range(len(counts))]
-        plot_bg_color = self._current_bg_color; plot_text_color = self._current_text_color; bar_color = "#1f77b4"; line_color = "#ff7f0e"
-        fig = Figure(figsize=(7, 4), dpi=100, facecolor=plot_bg_color); ax1 = fig.add_subplot(111); ax1.set_facecolor(plot_bg_color)
-        ax1.bar(dates, counts, label='Cards Due Daily', color=bar_color, width=0.7); ax1.set_xlabel("Date", color=plot_text_color); ax1.set_ylabel("Cards Due", color=bar_color)
+        if list(forecast_data.keys()) != chart['dates']: return False # Date axis changed (e.g. past midnight)
+        counts = list(forecast_data.values()); cumulative_counts = list(itertools.accumulate(counts))
+        for rect, count in zip(chart['bars'], counts): rect.set_height(count)
+        chart['line'].set_ydata(cumulative_counts)
+        self._apply_stats_chart_theme()
+        for ax in (chart['ax1'], chart['ax2']): ax.relim(); ax.autoscale_view()
+        chart['key'] = self._stats_key()
+        self._style_stats_toolbar()
+        self.stats_figure_canvas.draw_idle()
+        return True
+
+    def _apply_stats_chart_theme(self):
+        """Applies the current theme colours to the forecast chart's figure, axes, ticks and labels."""
+        chart = self._stats_chart
+        if chart is None: return
+        fig = chart['fig']; ax1 = chart['ax1']; ax2 = chart['ax2']
+        plot_bg_color = self._current_bg_color; plot_text_color = self._current_text_color; bar_color = STATS_BAR_COLOR; line_color = STATS_LINE_COLOR
+        fig.set_facecolor(plot_bg_color); ax1.set_facecolor(plot_bg_color); ax1.xaxis.label.set_color(plot_text_color)
         ax1.tick_params(axis='y', labelcolor=bar_color, colors=plot_text_color); ax1.tick_params(axis='x', rotation=45, colors=plot_text_color); ax1.grid(True, axis='y', linestyle='--', alpha=0.6, color=plot_text_color)
-        ax2 = ax1.twinx(); ax2.plot(dates, cumulative_counts, label='Cumulative Due', color=line_color, marker='.', linestyle='-'); ax2.set_ylabel("Total Cumulative Cards", color=line_color); ax2.tick_params(axis='y', labelcolor=line_color, colors=plot_text_color)
-        fig.suptitle("Review Forecast", color=plot_text_color); ax1.set_title(f"Next {STATS_FORECAST_DAYS} Days", fontsize=10, color=plot_text_color)
+        ax2.tick_params(axis='y', labelcolor=line_color, colors=plot_text_color)
+        for text in chart['titles']: text.set_color(plot_text_color)
         for spine in ax1.spines.values(): spine.set_edgecolor(plot_text_color);
         for spine in ax2.spines.values(): spine.set_edgecolor(plot_text_color)
-        fig.tight_layout(rect=[0, 0.03, 1, 0.95])
-        self.stats_figure_canvas = FigureCanvasTkAgg(fig, master=parent_frame); canvas_widget = self.stats_figure_canvas.get_tk_widget(); canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-        self.stats_toolbar = NavigationToolbar2Tk(self.stats_figure_canvas, parent_frame, pack_toolbar=False)
+
+    def _style_stats_toolbar(self):
+        """Colours the Matplotlib navigation toolbar to match the current theme."""
+        if not self.stats_toolbar: return
         try:
-             toolbar_bg = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkFrame"]["fg_color"]); toolbar_fg = plot_text_color
+             toolbar_bg = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkFrame"]["fg_color"]); toolbar_fg = self._current_text_color
              self.stats_toolbar.configure(background=toolbar_bg)
              for item in self.stats_toolbar.winfo_children():
                  try: item.configure(bg=toolbar_bg, fg=toolbar_fg)
                  except tk.TclError: pass
         except Exception as e: print(f"Minor error styling toolbar: {e}")
-        self.stats_toolbar.update(); self.stats_toolbar.pack(side=tk.BOTTOM, fill=tk.X); self.stats_figure_canvas.draw()
 
     def _on_stats_close(self):
+        if self._stats_chart is not None: self._stats_chart_cache = self._stats_chart # Reopening with unchanged data skips the rebuild
         if self.stats_figure_canvas:
             try:
-                 plt.close(self.stats_figure_canvas.figure) # Close MPL figure first
-                 self.stats_figure_canvas.get_tk_widget().destroy()
+                 self.stats_figure_canvas.get_tk_widget().destroy() # The Figure itself is kept in _stats_chart_cache
             except Exception as e: print(f"Error closing stats canvas: {e}")
         if self.stats_toolbar:
             try: self.stats_toolbar.destroy()
             except Exception as e: print(f"Error closing stats toolbar: {e}")
-        self.stats_figure_canvas = None; self.stats_toolbar = None; self.stats_plot_frame = None
+        self.stats_figure_canvas = None; self.stats_toolbar = None; self.stats_plot_frame = None; self._stats_chart = None
         if self.stats_window:
             try: self.stats_window.destroy()
             except Exception as e: print(f"Error closing stats window: {e}")
@@ -1269,50 +2072,52 @@ class FlashcardApp(ctk.CTk):
 
 
     # --- Event Handling & Shortcuts ---
-    def _setup_shortcuts(self): self.bind("<KeyPress>", self._handle_keypress)
-    def _handle_keypress(self, event):
+    def _setup_shortcuts(self):
+        """Binds only the shortcut keys, so other keystrokes never reach Python."""
+        self.bind("<space>", self._on_advance_key); self.bind("<Return>", self._on_advance_key)
+        for rating in (1, 2, 3, 4): self.bind(f"<Key-{rating}>", partial(self._on_rating_key, rating))
+        self.bind("<Key-a>", self._on_add_card_key); self.bind("<Key-A>", self._on_add_card_key)
+
+    def _shortcuts_blocked(self) -> bool:
+        """True while another window holds the grab or a text input has focus."""
         active_grab = self.grab_current()
-        if active_grab and active_grab != self and hasattr(active_grab, 'focus_get') and active_grab.focus_get():
-             widget_toplevel = event.widget.winfo_toplevel()
-             if widget_toplevel == active_grab: return
-
-        if active_grab and active_grab != self: return
+        if active_grab and active_grab != self: return True
+        widget_type = type(self.focus_get())
+        is_input_focus = self._input_focus_by_type.get(widget_type)
+        if is_input_focus is None:
+            is_input_focus = self._input_focus_by_type[widget_type] = issubclass(widget_type, (ctk.CTkTextbox, ctk.CTkEntry, tk.Text, tk.Entry))
+        return is_input_focus
 
-        key_sym = event.keysym; is_space = key_sym == "space"; is_return = key_sym == "Return"; is_a = key_sym.lower() == "a"
+    def _on_add_card_key(self, event):
+        if self.add_card_button is not None and not self._shortcuts_blocked() and self.add_card_button.cget("state") == "normal":
+            self.open_add_card_window()
 
-        focused_widget = self.focus_get()
-        is_input_focus = isinstance(focused_widget, (ctk.CTkTextbox, ctk.CTkEntry, tk.Text, tk.Entry))
+    def _on_advance_key(self, event):
+        if not self._is_review_active or self._shortcuts_blocked(): return
+        if self.showing_answer: self.rate_card(3)
+        else: self.show_answer()
 
-        # Add Card Shortcut
-        if is_a and not is_input_focus and hasattr(self, 'add_card_button') and self.add_card_button.cget("state") == "normal":
-            self.open_add_card_window(); return
-
-        # Review Shortcuts
-        if not self._is_review_active: return
-
-        if is_space or is_return:
-            if is_input_focus: return
-            if self.showing_answer: self.rate_card(3)
-            else: self.show_answer()
-            return
-
-        if key_sym in ('1', '2', '3', '4') and self.showing_answer and not is_input_focus:
-             self.rate_card(int(key_sym)); return
+    def _on_rating_key(self, rating: int, event):
+        if self._is_review_active and self.showing_answer and not self._shortcuts_blocked(): self.rate_card(rating)
 
 
     def on_close(self):
         """Handles the main window closing event."""
-        self.save_all_dirty_cards() # Ensure data is saved
+        self._deck_load_futures = None # Drop any in-flight deck load; its results are never applied
+        self._deck_listing_future = None
+        self._deck_executor.shutdown(wait=False); self._card_list_executor.shutdown(wait=False)
+        self.flush_all_pending(sync=True) # Ensure data is saved and synced to disk
+        self._save_executor.shutdown(wait=True) # Already drained by flush_all_pending
 
         # Clean up tkinterweb frames explicitly
-        if hasattr(self, 'front_html_frame') and self.front_html_frame:
+        if self.front_html_frame is not None:
             try:
                 # Check if widget exists before destroying
                 if self.front_html_frame.winfo_exists():
                     self.front_html_frame.destroy()
             except Exception as e:
                 print(f"Error destroying front_html_frame: {e}")
-        if hasattr(self, 'back_html_frame') and self.back_html_frame:
+        if self.back_html_frame is not None:
             try:
                 if self.back_html_frame.winfo_exists():
                     self.back_html_frame.destroy()
@@ -1334,12 +2139,13 @@ class FlashcardApp(ctk.CTk):
         self.destroy() # Close the main application window
 
 
-# --- Manage Cards Window Class (MODIFIED for HTML unescaping) ---
+# --- Manage Cards Window Class ---
 
 class ManageCardsWindow(ctk.CTkToplevel):
     def __init__(self, master, app_instance: FlashcardApp):
         super().__init__(master)
         self.app = app_instance # Reference to the main FlashcardApp instance
+        self.tree: Optional[ttk.Treeview] = None; self.edit_button: Optional[ctk.CTkButton] = None # Set once the UI is built
 
         self.title("Manage Cards")
         self.geometry("950x600")
@@ -1356,8 +2162,12 @@ class ManageCardsWindow(ctk.CTkToplevel):
         self.search_var = tk.StringVar()
         self.search_entry = ctk.CTkEntry(top_frame, textvariable=self.search_var, width=200)
         self.search_entry.pack(side="left", padx=(0, 10))
+        self._filter_after_id: Optional[str] = None # Pending debounced filter while typing
+        self._repopulate_after_id: Optional[str] = None # Pending coalesced refresh after cards were added/edited (see mark_dirty)
+        self._post_delete_after_id: Optional[str] = None # Pending after_idle that removes _deleted_ids_to_remove from the view
+        self._deleted_ids_to_remove: Set[str] = set()
         self.search_entry.bind("<Return>", self._filter_cards)
-        self.search_entry.bind("<KeyRelease>", self._filter_cards) # Filter as user types
+        self.search_entry.bind("<KeyRelease>", self._schedule_filter) # Filter as user types (debounced)
 
         self.add_button = ctk.CTkButton(top_frame, text="Add New Card", width=120, command=self._add_card)
         self.add_button.pack(side="right", padx=(5, 5))
@@ -1388,14 +2198,18 @@ class ManageCardsWindow(ctk.CTkToplevel):
         self.tree.column("reviews", width=60, anchor="e")
         self.tree.column("lapses", width=60, anchor="e")
 
-        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self._display_data: List[Dict[str, Any]] = [] # Filtered + sorted cards; only the first _rows_inserted are in the tree
+        self._rows_inserted = 0
+        self._populate_future: Optional[concurrent.futures.Future] = None # In-flight background filter/sort, if any
+        self._populate_generation = 0 # Bumped per request so stale background results are dropped
+        self._last_render_key: Optional[Tuple[Any, ...]] = None # Inputs of the last populate, to skip identical refreshes
+        self._tree_vsb = vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(yscrollcommand=self._on_tree_yscroll, xscrollcommand=hsb.set)
         vsb.pack(side="right", fill="y")
         hsb.pack(side="bottom", fill="x")
         self.tree.pack(side="left", fill="both", expand=True)
 
-        self._apply_treeview_style()
         self.tree.bind("<<TreeviewSelect>>", self._on_selection_change)
         self._populate_card_list()
 
@@ -1404,77 +2218,57 @@ class ManageCardsWindow(ctk.CTkToplevel):
         close_button = ctk.CTkButton(bottom_frame, text="Close", command=self.on_close)
         close_button.pack()
 
-    def _apply_treeview_style(self):
-        """Applies theme colors to the ttk.Treeview."""
-        style = ttk.Style()
-        bg_col = self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkFrame"]["fg_color"])
-        fg_col = self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkLabel"]["text_color"])
-        select_bg_col = self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["fg_color"])
-        select_fg_col = self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["text_color"])
-
-        style.theme_use("default")
-        style.configure("Treeview", background=bg_col, foreground=fg_col, fieldbackground=bg_col, rowheight=25)
-        style.map("Treeview", background=[('selected', select_bg_col)], foreground=[('selected', select_fg_col)])
-        try: # Font setting might fail on some systems/themes
-             style.configure("Treeview.Heading", background=self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["fg_color"]),
-                             foreground=self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["text_color"]),
-                             relief="flat", font=ctk.ThemeManager.theme["CTkFont"]["family"])
-        except tk.TclError:
-             style.configure("Treeview.Heading", background=self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["fg_color"]),
-                             foreground=self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["text_color"]),
-                             relief="flat") # Fallback without font
-        style.map("Treeview.Heading", background=[('active', self.app._apply_appearance_mode(ctk.ThemeManager.theme["CTkButton"]["hover_color"]))])
-        self.update_idletasks()
-
-
     def _populate_card_list(self, sort_column=None, reverse=False):
-        """Clears and refills the Treeview with card data (unescaping for display)."""
+        """Clears and refills the Treeview with card data."""
         # Check if tree exists before proceeding
-        if not hasattr(self, 'tree') or not self.tree: return
-
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        if self.tree is None: return
 
         search_term = self.search_var.get().lower()
-        display_data = []
-        # Search in UNESCAPED content for user convenience
-        if search_term:
-            for card in self.app.deck_data:
-                front_unescaped = html.unescape(card.get('front', ''))
-                back_unescaped = html.unescape(card.get('back', ''))
-                if search_term in front_unescaped.lower() or search_term in back_unescaped.lower():
-                     display_data.append(card)
-        else:
-             display_data = self.app.deck_data[:] # Work with a copy
-
-        # --- Sorting ---
-        if sort_column:
-            key_func = None
-            # Sort based on UNESCAPED text for intuitive sorting
-            if sort_column == "deck": key_func = lambda card: os.path.basename(card.get('deck_filepath', ''))
-            elif sort_column == "front": key_func = lambda card: html.unescape(card.get('front', '')).lower()
-            elif sort_column == "back": key_func = lambda card: html.unescape(card.get('back', '')).lower()
-            elif sort_column == "next_review": key_func = lambda card: card.get('next_review_date', datetime.date.min)
-            elif sort_column == "interval": key_func = lambda card: card.get('interval_days', 0.0)
-            elif sort_column == "ease": key_func = lambda card: card.get('ease_factor', 0.0)
-            elif sort_column == "reviews": key_func = lambda card: card.get('reviews', 0)
-            elif sort_column == "lapses": key_func = lambda card: card.get('lapses', 0)
-
-            if key_func:
-                 try: display_data.sort(key=key_func, reverse=reverse)
-                 except Exception as e: print(f"Error sorting column {sort_column}: {e}")
-
-        # --- Insert Data (Unescape Front/Back for display in Treeview) ---
-        for card in display_data:
-            deck_name = os.path.splitext(os.path.basename(card.get('deck_filepath', '')))[0]
+        render_key = (sort_column, reverse, search_term, id(self.app.deck_data), len(self.app.deck_data), self.app._deck_data_version)
+        if render_key == self._last_render_key: return # Same cards, filter and order as what is shown (or being built)
+        self._last_render_key = render_key
+        self._populate_generation += 1
+        if self._populate_future is not None: self._populate_future.cancel(); self._populate_future = None
+        if len(self.app.deck_data) <= CARD_LIST_ASYNC_THRESHOLD:
+            self._apply_populated(filter_and_sort_cards(self.app.deck_data, search_term, sort_column, reverse, self.app._deck_name_for)); return
+        # Large deck: filter/sort on the worker so typing stays responsive; only the newest request is applied
+        self._populate_future = self.app._card_list_executor.submit(filter_and_sort_cards, self.app.deck_data, search_term, sort_column, reverse, self.app._deck_name_for)
+        self.after(20, self._check_populate_future, self._populate_future, self._populate_generation)
+
+    def _check_populate_future(self, future: concurrent.futures.Future, generation: int):
+        """Polls a background filter/sort and applies it unless a newer one was requested meanwhile."""
+        if future is not self._populate_future or generation != self._populate_generation: return # Superseded or window closed
+        if not future.done():
+            self.after(20, self._check_populate_future, future, generation); return
+        self._populate_future = None
+        try: display_data = future.result()
+        except Exception as e: print(f"Error filtering card list: {e}"); return
+        self._apply_populated(display_data)
+
+    def _apply_populated(self, display_data: List[Dict[str, Any]]):
+        """Replaces the Treeview rows with the first page of `display_data` (the rest is paged in by _on_tree_yscroll)."""
+        self.tree.delete(*self.tree.get_children()) # One Tcl call
+        self._display_data = display_data; self._rows_inserted = 0
+        self._insert_next_rows()
+        self._on_selection_change() # Deleted rows may have been selected
+
+    def _on_tree_yscroll(self, first, last):
+        """Updates the scrollbar and pages in more rows once the view nears the end of the inserted ones."""
+        self._tree_vsb.set(first, last)
+        if float(last) >= 0.9 and self._rows_inserted < len(self._display_data): self._insert_next_rows()
+
+    def _insert_next_rows(self):
+        """Inserts the next CARD_LIST_PAGE_SIZE cards of _display_data into the Treeview."""
+        start = self._rows_inserted; end = min(start + CARD_LIST_PAGE_SIZE, len(self._display_data))
+        # Call the Tcl insert directly: the values tuple becomes a Tcl list as-is, skipping ttk's per-row option formatting
+        tree_call = self.tree.tk.call; tree_path = str(self.tree); deck_name_for = self.app._deck_name_for
+        for card in self._display_data[start:end]:
+            deck_name = deck_name_for(card.get('deck_filepath', ''))
             next_review_str = card.get('next_review_date').strftime(DATE_FORMAT) if card.get('next_review_date') else "N/A"
-            # Unescape front and back for display
-            front_display = html.unescape(card.get('front', ''))
-            back_display = html.unescape(card.get('back', ''))
             values = (
                 deck_name,
-                front_display,
-                back_display,
+                card.get('front', ''),
+                card.get('back', ''),
                 next_review_str,
                 f"{card.get('interval_days', 0.0):.1f}",
                 f"{card.get('ease_factor', 0.0):.2f}",
@@ -1482,9 +2276,10 @@ class ManageCardsWindow(ctk.CTkToplevel):
                 card.get('lapses', 0)
             )
             try:
-                self.tree.insert("", "end", iid=card.get('id'), values=values)
+                tree_call(tree_path, "insert", "", "end", "-id", card['id'], "-values", values)
             except tk.TclError as e:
                 print(f"Error inserting item into Treeview (maybe during close?): {e}")
+        self._rows_inserted = end
 
 
     # _sort_column, _filter_cards, _on_selection_change, _get_selected_card_dicts,
@@ -1498,11 +2293,29 @@ class ManageCardsWindow(ctk.CTkToplevel):
 
     def _filter_cards(self, event=None):
         """Filters the card list based on the search entry."""
+        if self._filter_after_id is not None: self.after_cancel(self._filter_after_id); self._filter_after_id = None
         self._populate_card_list() # Repopulate applies the filter
 
+    def _schedule_filter(self, event=None):
+        """Restarts a 150 ms timer so a burst of keystrokes triggers a single repopulate."""
+        if self._filter_after_id is not None: self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(150, self._do_filter)
+
+    def _do_filter(self):
+        self._filter_after_id = None
+        self._populate_card_list()
+
+    def mark_dirty(self):
+        """Schedules one repopulate for any number of card adds/edits made in quick succession."""
+        if self._repopulate_after_id is None: self._repopulate_after_id = self.after(50, self._do_repopulate)
+
+    def _do_repopulate(self):
+        self._repopulate_after_id = None
+        self._populate_card_list()
+
     def _on_selection_change(self, event=None):
         """Enables/disables Edit/Delete buttons based on selection."""
-        if not hasattr(self, 'edit_button'): return # UI not ready
+        if self.edit_button is None or self.tree is None: return # UI not ready
         selected_items = self.tree.selection()
         if selected_items:
             self.edit_button.configure(state="normal" if len(selected_items) == 1 else "disabled")
@@ -1513,15 +2326,9 @@ class ManageCardsWindow(ctk.CTkToplevel):
 
     def _get_selected_card_dicts(self) -> List[Dict[str, Any]]:
         """Gets the full card dictionaries for selected Treeview items."""
-        if not hasattr(self, 'tree'): return [] # UI not ready
-        selected_iids = self.tree.selection()
-        selected_cards = []
-        for iid in selected_iids:
-            # Find the card in the main app data using the iid
-            card = next((c for c in self.app.deck_data if c.get('id') == iid), None)
-            if card:
-                selected_cards.append(card)
-        return selected_cards
+        if self.tree is None: return [] # UI not ready
+        card_by_id = self.app._card_by_id # Tree iids are card ids
+        return [card_by_id[iid] for iid in self.tree.selection() if iid in card_by_id]
 
     def _add_card(self):
         """Opens the add card window."""
@@ -1540,75 +2347,105 @@ class ManageCardsWindow(ctk.CTkToplevel):
 
     def _delete_cards(self):
         """Deletes selected cards after confirmation."""
-        selected_cards = self._get_selected_card_dicts()
-        if not selected_cards:
+        card_by_id = self.app._card_by_id # Tree iids are card ids, so the selection alone identifies the cards
+        ids_to_delete = {iid for iid in self.tree.selection() if iid in card_by_id}
+        if not ids_to_delete:
             messagebox.showerror("No Selection", "Please select card(s) to delete.", parent=self)
             return
 
-        count = len(selected_cards)
+        count = len(ids_to_delete)
         confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete {count} selected card(s)?\nThis action cannot be undone.", parent=self)
 
         if confirm:
-            deleted_count = 0
             files_affected = set()
-            ids_to_delete = {card.get('id') for card in selected_cards}
 
-            original_count = len(self.app.deck_data)
-            self.app.deck_data = [card for card in self.app.deck_data if card.get('id') not in ids_to_delete]
+            deck_data = self.app.deck_data; deindex = self.app._deindex_card; original_count = len(deck_data)
+            if len(ids_to_delete) <= original_count * IN_PLACE_DELETE_MAX_FRACTION:
+                # Few cards: delete them in place (back to front) rather than copying the whole deck
+                doomed = [i for i, card in enumerate(deck_data) if card['id'] in ids_to_delete] # Every loaded/added card has an id and a deck_filepath
+                for i in reversed(doomed):
+                    card = deck_data[i]; deindex(card)
+                    filepath = card['deck_filepath']
+                    if filepath: files_affected.add(filepath)
+                    del deck_data[i]
+                # Same list object: drop the views keyed on (list, size), which a later add could make look current again
+                self.app._hot_columns = None; self.app._due_heap = None
+            else:
+                # One pass over the deck both keeps the survivors and collects the files losing cards
+                survivors = []; keep = survivors.append
+                for card in deck_data:
+                    if card['id'] in ids_to_delete:
+                        deindex(card)
+                        filepath = card['deck_filepath']
+                        if filepath: files_affected.add(filepath)
+                    else:
+                        keep(card)
+                self.app.deck_data = survivors
             deleted_count = original_count - len(self.app.deck_data)
+            if not deleted_count: return # Nothing matched (e.g. the cards were already gone); no save or refresh needed
 
-            for card in selected_cards:
-                filepath = card.get('deck_filepath')
-                if filepath:
-                     files_affected.add(filepath)
-
-            self.app.files_needing_full_save.update(files_affected)
-
-            print(f"Deleted {deleted_count} card(s). Marked files for rewrite: {files_affected}")
+            print(f"Deleted {deleted_count} card(s). Marked {len(files_affected)} file(s) for rewrite.")
             self.app.update_status(f"Deleted {deleted_count} card(s).")
-            self.app.save_all_dirty_cards() # Save immediately to persist deletion
-            self._populate_card_list() # Refresh the view
-            self._on_selection_change() # Update button states
+            if files_affected:
+                self.app.files_needing_full_save.update(files_affected)
+                self.app._schedule_flush() # Deletions in quick succession share one rewrite; on_close flushes anything pending
+            # Refresh the view in one idle callback, so Tk does a single layout pass for the whole batch
+            self._deleted_ids_to_remove |= ids_to_delete
+            if self._post_delete_after_id is None: self._post_delete_after_id = self.after_idle(self._post_delete_refresh)
+
+    def _post_delete_refresh(self):
+        self._post_delete_after_id = None
+        card_ids = self._deleted_ids_to_remove; self._deleted_ids_to_remove = set()
+        if not self._remove_rows(card_ids): self._populate_card_list()
+        self._on_selection_change() # Update button states
+
+    def _remove_rows(self, card_ids: Set[str]) -> bool:
+        """Drops deleted cards from the shown list and deletes just their rows. Returns False if a full repopulate is needed."""
+        if self._populate_future is not None or self._last_render_key is None: return False # Shown rows are about to be replaced anyway
+        inserted = self._display_data[:self._rows_inserted]
+        iids = [card['id'] for card in inserted if card['id'] in card_ids] # Tree iids are card ids
+        if iids: self.tree.delete(*iids) # One Tcl call
+        self._rows_inserted -= len(iids)
+        self._display_data = [card for card in self._display_data if card['id'] not in card_ids]
+        # The remaining rows are exactly what a repopulate with the same filter and sort would show now
+        deck_data = self.app.deck_data
+        self._last_render_key = self._last_render_key[:3] + (id(deck_data), len(deck_data), self.app._deck_data_version)
+        return True
 
     def on_close(self):
         """Closes the manage cards window."""
-        self.destroy()
-        # Clear the reference in the main app instance only if it matches self
-        if self.app.manage_cards_window is self:
-            self.app.manage_cards_window = None
+        if self._filter_after_id is not None: self.after_cancel(self._filter_after_id); self._filter_after_id = None
+        if self._repopulate_after_id is not None: self.after_cancel(self._repopulate_after_id); self._repopulate_after_id = None
+        if self._post_delete_after_id is not None: self.after_cancel(self._post_delete_after_id); self._post_delete_after_id = None
+        if self._populate_future is not None: self._populate_future.cancel(); self._populate_future = None
+        self.destroy() # The app only holds a weak reference to this window
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    # Show dependency warnings from CTk messageboxes for better visibility
-    missing_deps = []
-    if not PIL_AVAILABLE:
-        missing_deps.append("Pillow (for Stats Plots): pip install Pillow")
-    if not TKINTERWEB_AVAILABLE:
-        missing_deps.append("tkinterweb (for Math Rendering): pip install tkinterweb")
-    if not MATPLOTLIB_AVAILABLE:
-        missing_deps.append("Matplotlib (for Stats Plots): pip install matplotlib")
-
-    if missing_deps:
-        try:
-            # Create temporary root only if needed for messagebox
-            root = ctk.CTk()
-            root.withdraw() # Hide root window
-            messagebox.showwarning(
-                "Missing Dependencies",
-                "The following libraries are missing or could not be imported:\n\n" +
-                "\n".join(missing_deps) +
-                "\n\nPlease install them to enable all features."
-                )
-            root.destroy() # Destroy temporary root
-        except Exception as e:
-            print(f"Error showing dependency warning messagebox: {e}")
-            # Also print to console as fallback
-            print("---")
-            print("Missing Dependencies:")
-            for dep in missing_deps: print(f"- {dep}")
-            print("---")
+    missing_deps = [message for available, message in _DEPENDENCY_MESSAGES if not available]
 
     # Proceed even if dependencies are missing, features will be disabled
     find_decks(DECKS_DIR) # Ensure decks dir exists
     app = FlashcardApp()
+
+    if missing_deps:
+        def show_dependency_warning():
+            # Shown from the app's own root rather than a temporary one
+            try:
+                messagebox.showwarning(
+                    "Missing Dependencies",
+                    "The following libraries are missing or could not be imported:\n\n" +
+                    "\n".join(missing_deps) +
+                    "\n\nPlease install them to enable all features.",
+                    parent=app
+                    )
+            except Exception as e:
+                print(f"Error showing dependency warning messagebox: {e}")
+                # Also print to console as fallback
+                print("---")
+                print("Missing Dependencies:")
+                for dep in missing_deps: print(f"- {dep}")
+                print("---")
+        app.after(0, show_dependency_warning)
+
     app.mainloop()
\ No newline at end of file